@@ -32,9 +32,9 @@ def choose_parser(opts):
     elif opts.inputFormat == "CMSSW":
         return parsers.CMSSWParticleListParser(filename=opts.input)
     elif opts.inputFormat == "HEPPY":
-        return parsers.HeppyParser(filename=opts.input,
-                                   event_num=opts.eventNumber,
-                                   **opts.HEPPY_PARSER_OPTS)
+        return parsers.parser_opts["HEPPY"].parser(filename=opts.input,
+                                                   event_num=opts.eventNumber,
+                                                   **opts.HEPPY_PARSER_OPTS)
     elif opts.inputFormat == "HERWIG":
         return parsers.HerwigParser(filename=opts.input,
                                    event_num=opts.eventNumber)
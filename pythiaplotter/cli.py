@@ -17,6 +17,10 @@ from pythiaplotter import __version__
 
 log = get_logger(__name__)
 
+# Map of file extension to the parser associated with it, for guessing the input format
+_EXT_TO_PARSER = {popt.file_extension: pname for pname, popt in parser_opts.items()
+                  if popt.file_extension}
+
 
 def get_args(input_args):
     """Get argparse.Namespace of parsed user arguments, with sensible defaults set."""
@@ -202,7 +206,7 @@ def set_default_output_settings(args):
         if not args.outputFormat:
             args.outputFormat = printer_opts_checked[args.printer].default_output_fmt
             log.info("You didn't specify an output format, defaulted to %s", args.outputFormat)
-        filename = "".join([stem_name, "_", str(args.eventNumber), ".", args.outputFormat])
+        filename = "%s_%d.%s" % (stem_name, args.eventNumber, args.outputFormat)
         args.output = os.path.join(input_dir, filename)
         log.info("You didn't specify an output filename, setting it to %s", args.output)
 
@@ -210,15 +214,12 @@ def set_default_output_settings(args):
 def set_default_input_format(args):
     """Set default input format if the user hasn't."""
     if not args.inputFormat:
-        for pname, popt in parser_opts.items():
-            input_extension = os.path.splitext(args.input)[1]
-            if input_extension.lower() == popt.file_extension:
-                args.inputFormat = pname
-                log.info("You didn't set an input format. Assuming %s", args.inputFormat)
-                break
-        else:
+        input_extension = os.path.splitext(args.input)[1].lower()
+        if input_extension not in _EXT_TO_PARSER:
             raise RuntimeError("Cannot determine input format. "
                                "Must be one of {}".format(list(parser_opts.keys())))
+        args.inputFormat = _EXT_TO_PARSER[input_extension]
+        log.info("You didn't set an input format. Assuming %s", args.inputFormat)
 
 
 def set_default_mode(args):
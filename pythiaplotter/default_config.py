@@ -54,6 +54,10 @@ DOT_LABEL_OPTS = {
 # Each entry must be a dict, with 2 fields: "filter" and "attr".
 # "filter" must hold a lambda, that takes in a particle and returns a bool.
 # If this evaluates True, the styling will be used.
+# For styling by PDGID, "filter" can instead be replaced by a "pdgid" field,
+# holding a list of int PDGIDs. This matches both particle and anti-particle,
+# and is quicker than using the equivalent lambda. An entry cannot have both.
+# The first entry that matches a particle is used.
 # The "attr"" field must hold a dict, with keys "node" and "edge".
 # The "node" dict is used for NODE particle representation, and similarly
 # the "edge" dict for EDGE representation.
@@ -63,7 +67,7 @@ DOT_LABEL_OPTS = {
 DOT_PARTICLE_OPTS = [
     # Style b quarks
     dict(
-        filter=lambda p: abs(p.pdgid) == 5,
+        pdgid=[5],
         attr={
             "node": {
                 "style": "filled",
@@ -77,7 +81,7 @@ DOT_PARTICLE_OPTS = [
     ),
     # Style muons, taus
     dict(
-        filter=lambda p: abs(p.pdgid) in [13, 15],
+        pdgid=[13, 15],
         attr={
             "node": {
                 "style": "filled",
@@ -92,7 +96,7 @@ DOT_PARTICLE_OPTS = [
     ),
     # Style gluons
     dict(
-        filter=lambda p: abs(p.pdgid) == 21,
+        pdgid=[21],
         attr={
             "node": {
                 "style": "filled",
@@ -106,7 +110,7 @@ DOT_PARTICLE_OPTS = [
     ),
     # Style photons
     dict(
-        filter=lambda p: abs(p.pdgid) == 22,
+        pdgid=[22],
         attr={
             "node": {
                 "style": "filled",
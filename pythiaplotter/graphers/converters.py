@@ -3,6 +3,7 @@
 
 from __future__ import absolute_import
 import copy
+import logging
 import networkx as nx
 from pythiaplotter.utils.logging_config import get_logger
 from pythiaplotter.parsers.event_classes import NodeParticle, EdgeParticle
@@ -308,8 +309,10 @@ def construct_edges_from_nodes(graph):
                 return vtx.pop()
         return None
 
+    debug_enabled = log.isEnabledFor(logging.DEBUG)
     for node, data in list(graph.nodes(data=True)):
-        log.debug("Constructing EP for node %d", node)
+        if debug_enabled:
+            log.debug("Constructing EP for node %d", node)
         # Figure out the outgoing vertex barcode, use parent's incoming one if there is a parent,
         # or any sibling outgoing one. Otherwise create unique one.
         ob = _find_outgoing_vtx_barcode(graph, node) or len(vtx_barcodes)
@@ -324,7 +327,8 @@ def construct_edges_from_nodes(graph):
         graph.node[node]['out_vtx'] = ob
         graph.node[node]['in_vtx'] = ib
         ep = EdgeParticle(particle=data['particle'], vtx_in_barcode=ib, vtx_out_barcode=ob)
-        log.debug("Adding EdgeParticle %s", ep)
+        if debug_enabled:
+            log.debug("Adding EdgeParticle %s", ep)
         edge_particles.append(ep)
 
     return edge_particles
@@ -15,6 +15,8 @@ outgoing edge for node c.
 
 
 from __future__ import absolute_import
+import logging
+from collections import deque
 from pythiaplotter.utils.logging_config import get_logger
 import networkx as nx
 
@@ -48,23 +50,21 @@ def assign_particles_edges(edge_particles):
 
     # assign an edge for each Particle object, preserving direction
     # note that NetworkX auto adds nodes when edges are added
+    gr.add_edges_from((ep.vtx_out_barcode, ep.vtx_in_barcode,
+                       {'barcode': ep.barcode, 'particle': ep.particle})
+                      for ep in edge_particles)
+
+    # Mark the initial state particles (those outgoing from a node with no
+    # incoming edges), and final state particles (those incoming to a node
+    # with no outgoing edges). Since we already have the vertex barcodes for
+    # every edge, we can do this in one pass without asking the graph.
+    out_nodes = set(ep.vtx_out_barcode for ep in edge_particles)
+    in_nodes = set(ep.vtx_in_barcode for ep in edge_particles)
     for ep in edge_particles:
-        gr.add_edge(ep.vtx_out_barcode, ep.vtx_in_barcode,
-                    barcode=ep.barcode, particle=ep.particle)
-        log.debug("Add edge %s > %s for %s", ep.vtx_out_barcode, ep.vtx_in_barcode, ep.particle)
-
-    # Get in-degree for nodes so we can mark the initial state ones
-    # (those with no incoming edges) and their particles
-    for node, degree in list(gr.in_degree(gr.nodes())):
-        if degree == 0:
-            for _, _, edge_data in list(gr.out_edges(node, data=True)):
-                edge_data['particle'].initial_state = True
-
-    # Do same for final-state nodes/particles (nodes which have no outgoing edges)
-    for node, degree in list(gr.out_degree(gr.nodes())):
-        if degree == 0:
-            for _, _, edge_data in list(gr.in_edges(node, data=True)):
-                edge_data['particle'].final_state = True
+        if ep.vtx_out_barcode not in in_nodes:
+            ep.particle.initial_state = True
+        if ep.vtx_in_barcode not in out_nodes:
+            ep.particle.final_state = True
 
     log.debug("Edges after assigning: %s", gr.edges())
     log.debug("Nodes after assigning: %s", gr.nodes())
@@ -72,7 +72,7 @@ def assign_particles_edges(edge_particles):
     return gr
 
 
-def remove_particle_edge(graph, edge):
+def remove_particle_edge(graph, edge, key=None):
     """Remove a particle edge from the graph.
 
     Rewires the other particles such that the nodes at either end of the edge
@@ -86,32 +86,40 @@ def remove_particle_edge(graph, edge):
     graph: NetworkX.MultiDiGraph
     edge : (int, int)
         Outgoing node, incoming node
+    key : optional
+        Key of the edge between those nodes, needed to pick out the right
+        particle if there are several self-loops on one node
     """
     # rewire: ensure all incoming parents and all outgoing children use same vtx
     out_node, in_node = edge
 
-    parents = graph.predecessors(out_node)
-    if (len(parents) == 0 and len(graph.successors(out_node)) == 0):
+    # A particle looping back into its own vertex (e.g. after its parallel
+    # sibling was removed) has nothing to merge, so just drop it
+    if out_node == in_node:
+        graph.remove_edge(out_node, in_node, key)
+        return
+
+    # Use the adjacency dicts directly, rather than building lists
+    # via predecessors()/successors() just to count them
+    if len(graph.pred[out_node]) == 0 and len(graph.succ[out_node]) == 0:
         graph.remove_node(out_node)
         return
 
-    children = graph.successors(in_node)
-    if (len(children) == 0 and len(graph.predecessors(in_node)) == 1):
+    children = list(graph.succ[in_node])
+    if len(children) == 0 and len(graph.pred[in_node]) == 1:
         graph.remove_node(in_node)
         return
 
-    for child in children:
-        these = graph[in_node][child]
-        for x in these:  # since Multi DiGraph
-            log.debug("Adding %d %d %s", out_node, child, these[x])
-            graph.add_edge(out_node, child, **these[x])
+    # outgoing edges from the in_node now come from the out_node
+    # (there may be several for each child since Multi DiGraph)
+    graph.add_edges_from([(out_node, child, data)
+                          for child in children
+                          for data in graph[in_node][child].values()])
 
-    # incoming edges to the in_node
-    for out_e, in_e, edge_data in graph.in_edges(in_node, data=True):
-        if (out_e, in_e) == (out_node, in_node):
-            continue  # ignore the original edge itself!
-        log.debug("Adding %d %d %s", out_e, out_node, **edge_data)
-        graph.add_edge(out_e, out_node, **edge_data)
+    # incoming edges to the in_node, ignoring the original edge itself!
+    graph.add_edges_from([(out_e, out_node, data)
+                          for out_e, in_e, data in graph.in_edges(in_node, data=True)
+                          if (out_e, in_e) != (out_node, in_node)])
 
     graph.remove_node(in_node)
 
@@ -140,49 +148,62 @@ def remove_redundant_edges(graph):
     These redundants are useful to keep if considering MC internal workings,
     but otherwise are just confusing and a waste of space.
 
-    Since it loops over the list of graph edges, we can only remove one edge in
-    a loop, otherwise adding extra/replacement edges ruins the sibling counting
-    and doesn't remove redundants. So the method loops through the graph edges
-    until there are no more redundant edges.
+    A redundant edge is found by looking at its out node, and removing it merges
+    its in node into that out node. The only node whose parent/sibling/child
+    counting this can change is the merged node itself, as it takes over the
+    children and any other incoming edges of the in node. So a single pass
+    over the nodes is enough, as long as each node is re-checked after a merge
+    until it no longer has a redundant outgoing edge. Nodes that have been
+    merged away are skipped.
 
     Since we are dealing with MultiDiGraph, we have to be careful about siblings
     that actually span the same set of nodes - these shouldn't be removed.
 
-    There is probably a more sensible way to do this, currently brute
-    force and slow.
-
     Parameters
     ----------
     graph : NetworkX.MultiDiGraph
         Graph to remove redundant nodes from.
     """
+    debug_enabled = log.isEnabledFor(logging.DEBUG)
+    for out_node in list(graph.nodes()):
+        # each removal merges the in node into out_node, so re-check it
+        while out_node in graph:
+            # Exactly 1 parent (incoming to out_node), no siblings (outgoing
+            # from out_node), and > 0 children (outgoing from in_node).
+            # Degrees count parallel edges separately, as required.
+            if graph.in_degree(out_node) != 1 or graph.out_degree(out_node) != 1:
+                break
+            out_edge = next(iter(graph.out_edges(out_node, keys=True, data=True)))
+            _, in_node, key, edge_data = out_edge
+            if graph.out_degree(in_node) == 0:
+                break
+            _, _, parent_data = next(iter(graph.in_edges(out_node, data=True)))
+            if parent_data["particle"].pdgid != edge_data["particle"].pdgid:
+                break
 
-    done_removing = False
-    while not done_removing:
-        done_removing = True
-        for out_node, in_node, edge_data in list(graph.edges(data=True)):
-            # get all incoming edges to this particle's out node (parents)
-            parent_edges = graph.in_edges(out_node, data=True)
-            # get all outgoing edges from this particle's out node (siblings)
-            sibling_edges = graph.out_edges(out_node)
-            # get all outgoing edges from this particle's in node (children)
-            child_edges = graph.out_edges(in_node)
+            if debug_enabled:
+                log.debug("Removing redundant edge (%d, %d) %s", out_node, in_node, edge_data)
+                log.debug("Parent edges: %s", list(graph.in_edges(out_node)))
+                log.debug("Child edges: %s", list(graph.out_edges(in_node)))
+            remove_particle_edge(graph, (out_node, in_node), key)
 
-            if len(parent_edges) == 1 and len(child_edges) != 0 and len(sibling_edges) == 1:
-                parent_out, parent_in, parent_data = parent_edges[0]
 
-                # Do removal if parent PDGID matches
-                if parent_data["particle"].pdgid == edge_data["particle"].pdgid:
-                    log.debug("Doing edge: %d %d", out_node, in_node)
-                    log.debug("Parent edges: %s", parent_edges)
-                    log.debug("Child edges: %s", child_edges)
+def _has_edge_data(graph, out_node, in_node, key, edge_data):
+    """Check if the edge out_node -> in_node with this key & exact data dict is still in the graph.
 
-                    done_removing = False
+    Parameters
+    ----------
+    graph : NetworkX.MultiDiGraph
+    out_node, in_node : int
+    key
+    edge_data : dict
 
-                    log.debug("Removing redundant edge (%d, %d) %s", out_node, in_node, edge_data)
-                    remove_particle_edge(graph, (out_node, in_node))
+    Returns
+    -------
+    bool
+    """
+    return graph.has_edge(out_node, in_node, key) and graph[out_node][in_node][key] is edge_data
 
-                    break
 
 def remove_edges_by_pdgid(graph, pdgid, final_state_only=True):
     """Remove particles with pdgid from graph.
@@ -197,14 +218,38 @@ def remove_edges_by_pdgid(graph, pdgid, final_state_only=True):
     final_state_only : bool, optional
         Only remove final state particles
     """
-    # Do a while loop as editign whilst iterating could lead to issues.
-    done_removing = False
-    while not done_removing:
-        done_removing = True
-        for out_vtx, in_vtx, edge_data in list(graph.edges(data=True)):
-            if ((abs(edge_data['particle'].pdgid) == pdgid) and
-                ((final_state_only and len(graph.successors(in_vtx)) == 0) or
-                 not final_state_only)):
-                remove_particle_edge(graph, (out_vtx, in_vtx))
-                done_removing = False
-                break
+    # Only edges with the right PDGID can ever be removed, so find those once.
+    # Removing an edge rewires the edges around its out vertex, which can
+    # change whether they are final-state, so those get re-checked,
+    # whilst candidates that have since been rewired are skipped.
+    edges_to_check = deque(_edges_with_pdgid(graph.edges(keys=True, data=True), pdgid))
+    while edges_to_check:
+        out_vtx, in_vtx, key, edge_data = edges_to_check.popleft()
+        if not _has_edge_data(graph, out_vtx, in_vtx, key, edge_data):
+            continue  # stale entry, edge has been rewired or removed since queued
+        if final_state_only and len(graph.succ[in_vtx]) != 0:
+            continue
+
+        remove_particle_edge(graph, (out_vtx, in_vtx), key)
+
+        if out_vtx in graph:
+            edges_to_check.extend(_edges_with_pdgid(
+                graph.in_edges(out_vtx, keys=True, data=True), pdgid))
+            edges_to_check.extend(_edges_with_pdgid(
+                graph.out_edges(out_vtx, keys=True, data=True), pdgid))
+
+
+def _edges_with_pdgid(edges, pdgid):
+    """Filter (out, in, key, data) edges to those whose particle has PDGID +/-pdgid.
+
+    Parameters
+    ----------
+    edges : iterable[(int, int, key, dict)]
+    pdgid : int
+
+    Returns
+    -------
+    list[(int, int, key, dict)]
+    """
+    return [(out_vtx, in_vtx, key, edge_data) for out_vtx, in_vtx, key, edge_data in edges
+            if abs(edge_data['particle'].pdgid) == pdgid]
@@ -2,6 +2,7 @@
 
 
 from __future__ import absolute_import
+from collections import Counter, deque
 from pythiaplotter.utils.logging_config import get_logger
 import networkx as nx
 
@@ -31,36 +32,55 @@ def assign_particles_nodes(node_particles):
     gr = nx.MultiDiGraph()
 
     # assign a node for each Particle obj
-    for np in node_particles:
-        gr.add_node(np.particle.barcode, particle=np.particle)
+    gr.add_nodes_from((np.particle.barcode, {'particle': np.particle}) for np in node_particles)
 
     # get the barcode of the system to avoid useless edges
     # and non-existent particles. 0 for Pythia8, -1 for CMSSW, but easiest
     # is to check in the list of nodes (since node barcode = particle barcode)
-    system_barcode = -1 if 0 in gr.nodes() else 0
-
-    # assign edges between Parents/Children
+    system_barcode = -1 if 0 in gr else 0
+
+    # assign edges between Parents/Children, adding them all in one go,
+    # counting the number of parents & children of each node as we go.
+    # A parent may be listed more than once, but one edge is enough
+    # to represent the relationship.
+    edges = []
+    seen_edges = set()
+    n_parents, n_children = Counter(), Counter()
     for np in node_particles:
         if np.parent_barcodes:
             if np.parent_barcodes[0] == system_barcode and np.parent_barcodes[-1] == system_barcode:
                 continue
             for i in np.parent_barcodes:
-                gr.add_edge(i, np.particle.barcode)
+                edge = (i, np.particle.barcode)
+                if edge in seen_edges:
+                    continue
+                seen_edges.add(edge)
+                edges.append(edge)
+                n_children[i] += 1
+                n_parents[np.particle.barcode] += 1
+    gr.add_edges_from(edges)
 
     # Set initial_state and final_state flags, based on number of parents
     # (for initial_state) or number of children (for final_state)
     # This should be the only place it is done, otherwise confusing!
-    for node, data in list(gr.nodes(data=True)):
+    # Nodes with neither parents nor children are isolated, so are removed.
+    isolated_nodes = []
+    for node, data in gr.nodes(data=True):
+        initial_state = n_parents[node] == 0
+        final_state = n_children[node] == 0
 
-        if len(list(gr.predecessors(node))) == 0:
+        if initial_state:
             data['particle'].initial_state = True
 
-        if len(list(gr.successors(node))) == 0:
+        if final_state:
             data['particle'].final_state = True
 
+        if initial_state and final_state:
+            isolated_nodes.append(node)
+
     # log.debug("Graph nodes after assigning: %s" % gr.node)
 
-    remove_isolated_nodes(gr)
+    gr.remove_nodes_from(isolated_nodes)
 
     return gr
 
@@ -75,9 +95,10 @@ def remove_particle_node(graph, node):
         Node to remove.
     """
     # rewire - ensure all it's parents decay to all it's children
-    for child in graph.successors(node):
-        for parent in graph.predecessors(node):
-            graph.add_edge(parent, child)
+    # (as a list, since adding edges whilst iterating over the neighbours could lead to issues)
+    parents = list(graph.predecessors(node))
+    graph.add_edges_from([(parent, child)
+                          for child in graph.successors(node) for parent in parents])
     graph.remove_node(node)  # also removes the relevant edges
 
 
@@ -88,10 +109,8 @@ def remove_isolated_nodes(gr):
     ----------
     gr : NetworkX.MultiDiGraph
     """
-    nodes = list(gr.nodes())[:]
-    for np in nodes:
-        if len(list(gr.predecessors(np))) == 0 and len(list(gr.successors(np))) == 0:
-            gr.remove_node(np)
+    gr.remove_nodes_from([np for np in gr.nodes()
+                          if gr.in_degree(np) == 0 and gr.out_degree(np) == 0])
 
 
 def remove_redundant_nodes(graph):
@@ -112,21 +131,23 @@ def remove_redundant_nodes(graph):
     graph : NetworkX.MultiDiGraph
         Graph to remove redundant nodes from
     """
-    graph_new = graph.copy()  # use copy to avoid modifying the thing we're iterating over
-    removed_nodes = []  # need to keep track of things we've removed
-    for node, data in list(graph_new.nodes(data=True)):
-        if node in removed_nodes:
+    # Iterate over a snapshot of the nodes, to avoid modifying the thing we're
+    # iterating over. Count distinct parents/children via the adjacency dicts,
+    # since the degree would count parallel edges more than once.
+    nodes = list(graph.nodes(data=True))
+    # Removing nodes only rewires edges, so the snapshot can also be used to look
+    # up particles, rather than going via graph.node (gone in NetworkX >= 2.4)
+    # or graph.nodes[] (not in NetworkX 1.x)
+    particles = {node: data['particle'] for node, data in nodes}
+    for node, data in nodes:
+        parents = graph.pred[node]
+        if len(parents) != 1 or len(graph.succ[node]) != 1:
             continue
-        children = list(graph.successors(node))
-        parents = list(graph.predecessors(node))
-        if len(children) == 1 and len(parents) == 1:
-            p = data['particle']
-            parent = graph.node[parents[0]]['particle']
-            child = graph.node[children[0]]['particle']
-            if parent.pdgid == p.pdgid:
-                log.debug("Removing (%d) %s", node, data['particle'])
-                remove_particle_node(graph, node)
-                removed_nodes.append(node)
+        p = data['particle']
+        parent = particles[next(iter(parents))]
+        if parent.pdgid == p.pdgid:
+            log.debug("Removing (%d) %s", node, data['particle'])
+            remove_particle_node(graph, node)
 
 
 def remove_nodes_by_pdgid(graph, pdgid, final_state_only=True):
@@ -142,14 +163,25 @@ def remove_nodes_by_pdgid(graph, pdgid, final_state_only=True):
     final_state_only : bool, optional
         Only remove final state particles
     """
-    # Do a while loop as editign whilst iterating could lead to issues.
-    done_removing = False
-    while not done_removing:
-        done_removing = True
-        for node, node_data in list(graph.nodes(data=True)):
-            if ((abs(node_data['particle'].pdgid) == pdgid) and
-                ((final_state_only and len(graph.successors(node)) == 0) or
-                 not final_state_only)):
-                remove_particle_node(graph, node)
-                done_removing = False
-                break
+    # Removing a node only rewires its parents & children, so all the
+    # candidates can be found up front. However, removing a final-state
+    # particle can leave its parents without any children, so any matching
+    # parents are checked again afterwards.
+    # Removal order matters, since rewiring can add parallel edges,
+    # so work through the candidates in graph order.
+    matches = [node for node, node_data in graph.nodes(data=True)
+               if abs(node_data['particle'].pdgid) == pdgid]
+    candidates = set(matches)
+    nodes_to_check = deque(matches)
+    while nodes_to_check:
+        node = nodes_to_check.popleft()
+        if node not in graph:
+            continue  # already removed
+        if not final_state_only:
+            remove_particle_node(graph, node)
+            continue
+        if graph.out_degree(node) != 0:
+            continue
+        parents = list(graph.predecessors(node))
+        remove_particle_node(graph, node)
+        nodes_to_check.extend(p for p in parents if p in candidates)
@@ -9,6 +9,13 @@ parser_opts : dict[str, ParserOption]
 
 
 from __future__ import absolute_import
+import sys
+from importlib import import_module
+try:
+    from importlib.util import find_spec
+except ImportError:
+    from pkgutil import find_loader as find_spec  # python 2
+from types import ModuleType
 from pythiaplotter.utils.logging_config import get_logger
 from pythiaplotter.utils.common import generate_repr_str, check_representation_str
 from .pythia8_parser import Pythia8Parser
@@ -31,8 +38,10 @@ class ParserOption(object):
         description : str
             Brief description about parser
 
-        parser : class
-            The Parser class
+        parser : class, str
+            The Parser class, or its import path as "module:class".
+            The latter is only imported when first used, for parsers
+            that have expensive dependencies.
 
         default_representation : {'NODE', 'EDGE'}
             Default particle representation of the parser.
@@ -41,7 +50,7 @@ class ParserOption(object):
             Optional file extension to associate with this parser. (no preceeding .)
         """
         self.description = description
-        self.parser = parser
+        self._parser = parser
         self.file_extension = file_extension
         check_representation_str(default_representation, "default_representation")
         self.default_representation = default_representation
@@ -52,6 +61,14 @@ class ParserOption(object):
     def __str__(self):
         return "{0}({1})".format(self.__class__.__name__, self.description)
 
+    @property
+    def parser(self):
+        """The Parser class, importing it first if necessary."""
+        if isinstance(self._parser, str):
+            module_name, class_name = self._parser.split(":")
+            self._parser = getattr(import_module(module_name), class_name)
+        return self._parser
+
 
 # Keys of this dict will be the commandline options for --inputFormat
 parser_opts = {
@@ -92,14 +109,41 @@ parser_opts = {
     )
 }
 
-# Have to wrap the ROOT parts carefully, because it isn't installed easily with pip
-try:
-    from .heppy_parser import HeppyParser
+# Have to wrap the ROOT parts carefully, because it isn't installed easily with pip.
+# Importing ROOT is also slow, so only check it is available here,
+# and leave the actual import until the Heppy parser is used.
+if find_spec("ROOT") is not None:
     parser_opts['HEPPY'] = ParserOption(
         description="For Heppy ROOT files",
-        parser=HeppyParser,
+        parser="pythiaplotter.parsers.heppy_parser:HeppyParser",
         file_extension=None,
         default_representation="NODE"
     )
-except ImportError:
+else:
     log.warning("Cannot import PyROOT, no interface to Heppy tree")
+
+
+
+class _ParsersModule(ModuleType):
+    """This package's module, which imports HeppyParser (and so ROOT) on first access.
+
+    Keeps ``from pythiaplotter.parsers import HeppyParser`` working,
+    without every run paying for importing ROOT.
+    """
+
+    def __getattr__(self, name):
+        # only called when the attribute isn't found normally
+        if name == "HeppyParser" and "HEPPY" in parser_opts:
+            return parser_opts["HEPPY"].parser
+        raise AttributeError("module %r has no attribute %r" % (self.__name__, name))
+
+
+try:
+    sys.modules[__name__].__class__ = _ParsersModule
+except TypeError:
+    # python < 3.5 can't change a module's class, so swap in a copy instead.
+    # Keep the original alive, as python 2 clears a module's globals when it is deleted.
+    _module = _ParsersModule(__name__)
+    _module.__dict__.update(sys.modules[__name__].__dict__)
+    _module._original_module = sys.modules[__name__]
+    sys.modules[__name__] = _module
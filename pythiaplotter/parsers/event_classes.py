@@ -54,6 +54,10 @@ class Event(object):
 @total_ordering
 class Particle(object):
 
+    # Kinematic fields that every particle has, even if the parser doesn't provide them
+    _default_kinematics = dict.fromkeys(
+        ['pt', 'eta', 'phi', 'px', 'py', 'pz', 'energy', 'mass'], 0.0)
+
     def __init__(self, barcode, pdgid=0, status=0,
                  initial_state=False, final_state=False, **kwargs):
         """Hold information about a particle in an event.
@@ -92,11 +96,11 @@ class Particle(object):
         self.final_state = final_state
         self.initial_state = initial_state
         # some default fields
-        for k in ['pt', 'eta', 'phi', 'px', 'py', 'pz', 'energy', 'mass']:
-            self.__dict__[k] = 0.0
-        self.__dict__.update(**kwargs)
-        if all([k in kwargs for k in ['px', 'py', 'pz']]):
-            pt, eta, phi = convert_px_py_pz(float(self.px), float(self.py), float(self.pz))
+        self.__dict__.update(self._default_kinematics)
+        self.__dict__.update(kwargs)
+        # Parsers already convert the momentum components to float
+        if 'px' in kwargs and 'py' in kwargs and 'pz' in kwargs:
+            pt, eta, phi = convert_px_py_pz(kwargs['px'], kwargs['py'], kwargs['pz'])
             self.__dict__['pt'] = pt
             self.__dict__['eta'] = eta
             self.__dict__['phi'] = phi
@@ -148,9 +152,7 @@ def convert_px_py_pz(px, py, pz):
         Transverse momentum, pseudorapidity, and azimuthal angle (in radians).
     """
     # transverse momentum
-    pt = math.sqrt(math.fsum([math.pow(px, 2), math.pow(py, 2)]))
-    # total momentum
-    p = math.sqrt(math.fsum([math.pow(pt, 2), math.pow(pz, 2)]))
+    pt = math.hypot(px, py)
     if pt != 0:
         eta = math.asinh(pz / pt)
         phi = math.asin(py / pt)
@@ -195,6 +197,9 @@ class EdgeParticle(object):
     Vertex barcodes are ints.
     """
 
+    # One per particle in an event, so avoid a __dict__ for each
+    __slots__ = ('particle', 'vtx_in_barcode', 'vtx_out_barcode')
+
     def __init__(self, particle, vtx_in_barcode, vtx_out_barcode):
         self.particle = particle
         self.vtx_in_barcode = int(vtx_in_barcode)
@@ -7,9 +7,10 @@ See example/example_hepmc.hepmc for example input file.
 
 
 from __future__ import absolute_import, division
+import logging
 from pprint import pformat
 from pythiaplotter.utils.logging_config import get_logger
-from pythiaplotter.utils.common import map_columns_to_dict, generate_repr_str
+from pythiaplotter.utils.common import generate_repr_str
 from .event_classes import Event, Particle, EdgeParticle
 
 
@@ -54,130 +55,181 @@ class HepMCParser(object):
             Collection of EdgeParticles to be assigned to a graph.
         """
         # Loop through file, line-by-line.
-        # Once we reach an event line with the require line number, then
-        # we start parsing the particle/vertex lines. Otherwise we eat up all the RAM!
+        # First skip ahead to the event line with the required event number,
+        # then parse the particle/vertex lines that follow it, stopping as soon
+        # as that event is complete. Otherwise we eat up all the RAM!
 
-        parse_event = False
         current_event = None
         current_vertex = None
-        edge_particles = []
+        # GenParticle lines are stored, along with the barcode of the vertex
+        # they are outgoing from, and converted in one go once the event is read
+        particle_lines = []
+        vtx_out_barcodes = []
         # since HepMC can output in either MeV or GeV, but we all prefer GeV,
         # this allows conversion to GeV
         energy_multiplier = 1.
 
         log.info("Opening event file %s", self.filename)
-        with open(self.filename) as f:
+        # Read as bytes: HepMC is plain ASCII, and this avoids decoding every
+        # line, the vast majority of which are GenParticle/GenVertex lines
+        # that can be split & converted as bytes. Only the rarer lines that are
+        # stored as text (event, units) get decoded.
+        with open(self.filename, "rb") as f:
+            # Lines from preceding events only need their first character checked
+            for line in f:
+                if line[:1] == b"E" and int(line.split(None, 2)[1]) == self.event_num:
+                    current_event = self.parse_event_line(line.strip().decode())
+                    break
+
+            # Carry on from the same position in the file.
+            # If the event wasn't found, there is nothing left to read.
+            # Bind the methods used per line up front, rather than
+            # looking them up on every iteration.
+            add_particle_line = particle_lines.append
+            add_vtx_out_barcode = vtx_out_barcodes.append
+            parse_vertex_line = self.parse_vertex_line
             for line in f:
                 line = line.strip()
-                if line == "":
-                    continue
-                if line.startswith("E") or "END_EVENT_LISTING" in line:
-                    # General GenEvent information
-                    if current_event:
-                        # Do only having read in all particles in an event
-                        break
-
-                    if line.startswith("E"):
-                        current_event = self.parse_event_line(line)
-                        if current_event.event_num == self.event_num:
-                            parse_event = True
-                        else:
-                            current_event = None
-
-                if not parse_event:
+                if not line:
                     continue
-
-                if line.startswith("V"):
-                    # GenVertex info
-                    current_vertex = self.parse_vertex_line(line)
-                elif line.startswith("P"):
+                # Dispatch on the first character, most common line types first
+                line_type = line[:1]
+                if line_type == b"P":
                     # GenParticle info
-                    edge_particle = self.parse_particle_line(line)
-                    edge_particle.vtx_out_barcode = current_vertex.barcode
-                    log.debug(edge_particle.particle)
-                    # If the particle has vtx_in_barcode = 0,
-                    # then this is a 'dangling' vertex (i.e. not in the list
-                    # of vertices) and we must create one instead.
-                    # Use (10000*|particle.vtx_out_barcode|)+particle.barcode
-                    # for a unique barcode, since we won't have 10000
-                    # particles in an event.
-
-                    def _generate_unique_id(edge_particle):
-                        return 10000 * abs(edge_particle.vtx_out_barcode) + edge_particle.barcode
-
-                    # This is a final-state particle
-                    if edge_particle.vtx_in_barcode == 0:
-                        edge_particle.vtx_in_barcode = _generate_unique_id(edge_particle)
-                        edge_particle.particle.final_state = True
-
-                    # If the vtx_in_barcode = vtx_out_barcode, then we have
-                    # a cyclical edge. This is normally reserved for an
-                    # incoming proton. Need to create a new "out" node, since
-                    # other particles will be outgoing from this node
-                    if edge_particle.vtx_in_barcode == edge_particle.vtx_out_barcode:
-                        edge_particle.vtx_out_barcode = _generate_unique_id(edge_particle)
-                        edge_particle.particle.initial_state = True
-
-                    edge_particles.append(edge_particle)
-                if line.startswith("U"):
+                    add_particle_line(line)
+                    add_vtx_out_barcode(current_vertex.barcode)
+                elif line_type == b"V":
+                    # GenVertex info
+                    current_vertex = parse_vertex_line(line)
+                elif line_type == b"E" or (line_type == b"H" and b"END_EVENT_LISTING" in line):
+                    # Start of the next GenEvent, or end of file:
+                    # we have read in all particles in our event
+                    break
+                elif line_type == b"U":
                     # Units info
-                    energy, length = self.parse_units_line(line)
+                    energy, length = self.parse_units_line(line.decode())
                     if energy == "MEV":
                         energy_multiplier = 1. / 1000
 
         if not current_event:
             raise IndexError("Cannot find an event with event number %d" % self.event_num)
 
-        # Correct units
-        for p in edge_particles:
-            for attr in ['px', 'py', 'pz', 'mass', 'energy', 'pt']:
-                try:
-                    val = getattr(p.particle, attr)
-                    setattr(p.particle, attr, val * energy_multiplier)
-                except AttributeError:
-                    pass
+        edge_particles = self.parse_particle_lines(particle_lines, vtx_out_barcodes,
+                                                   energy_multiplier)
+
+        # If the particle has vtx_in_barcode = 0,
+        # then this is a 'dangling' vertex (i.e. not in the list
+        # of vertices) and we must create one instead.
+        # Use (10000*|particle.vtx_out_barcode|)+particle.barcode
+        # for a unique barcode, since we won't have 10000
+        # particles in an event.
+
+        def _generate_unique_id(edge_particle):
+            return 10000 * abs(edge_particle.vtx_out_barcode) + edge_particle.barcode
+
+        # Saves a logging call per particle when not debugging
+        debug_enabled = log.isEnabledFor(logging.DEBUG)
+        for edge_particle in edge_particles:
+            if debug_enabled:
+                log.debug(edge_particle.particle)
+
+            # This is a final-state particle
+            if edge_particle.vtx_in_barcode == 0:
+                edge_particle.vtx_in_barcode = _generate_unique_id(edge_particle)
+                edge_particle.particle.final_state = True
+
+            # If the vtx_in_barcode = vtx_out_barcode, then we have
+            # a cyclical edge. This is normally reserved for an
+            # incoming proton. Need to create a new "out" node, since
+            # other particles will be outgoing from this node
+            if edge_particle.vtx_in_barcode == edge_particle.vtx_out_barcode:
+                edge_particle.vtx_out_barcode = _generate_unique_id(edge_particle)
+                edge_particle.particle.initial_state = True
 
         return current_event, edge_particles
 
     def parse_event_line(self, line):
         """Parse a HepMC GenEvent line and return an Event object"""
-        fields = ["event_num", "num_mpi", "scale", "aQCD", "aQED",
-                  "signal_process_id", "signal_process_vtx_id", "n_vtx",
-                  "beam1_pdgid", "beam2_pdgid"]
-        contents = map_columns_to_dict(fields, line[1:])
-        return Event(event_num=contents["event_num"], source=self.filename,
-                     signal_process_vtx_id=contents["signal_process_vtx_id"])
+        # fields: E, event_num, num_mpi, scale, aQCD, aQED, signal_process_id,
+        # signal_process_vtx_id, then n_vtx, beam1_pdgid, beam2_pdgid, ...
+        _, event_num, _, _, _, _, _, signal_process_vtx_id, _ = line.split(None, 8)
+        return Event(event_num=event_num, source=self.filename,
+                     signal_process_vtx_id=signal_process_vtx_id)
 
     def parse_vertex_line(self, line):
         """Parse a HepMC GenVertex line and return a GenVertex object"""
-        fields = ["barcode", "id", "x", "y", "z", "ctau", "n_orphan_in", "n_out"]
-        contents = map_columns_to_dict(fields, line[1:])
-        return GenVertex(barcode=abs(int(contents["barcode"])),
-                         n_orphan_in=contents["n_orphan_in"])
+        # fields: V, barcode, id, x, y, z, ctau, n_orphan_in, then n_out, ...
+        _, barcode, _, _, _, _, _, n_orphan_in, _ = line.split(None, 8)
+        return GenVertex(barcode=abs(int(barcode)), n_orphan_in=int(n_orphan_in))
 
     def parse_particle_line(self, line):
         """Parse a HepMC GenParticle line and return an EdgeParticle object
 
         Note that the EdgeParticle does not have vtx_out_barcode assigned here,
         since we are parsing a line in isolation. The vtx_out_barcode is added
-        in the main pars() method. We just use a dummy value for now.
+        in the main parse() method. We just use a dummy value for now.
         """
-        fields = ["barcode", "pdgid", "px", "py", "pz", "energy", "mass",
-                  "status", "pol_theta", "pol_phi", "vtx_in_barcode"]
-        contents = map_columns_to_dict(fields, line[1:])
-        p = Particle(barcode=int(contents["barcode"]),
-                     pdgid=int(contents["pdgid"]),
-                     status=contents["status"],
-                     px=float(contents["px"]),
-                     py=float(contents["py"]),
-                     pz=float(contents["pz"]),
-                     energy=float(contents["energy"]),
-                     mass=float(contents["mass"]))
-        log.debug(p)
-        ep = EdgeParticle(particle=p,
-                          vtx_in_barcode=abs(int(contents['vtx_in_barcode'])),
-                          vtx_out_barcode=0)
-        return ep
+        return self.parse_particle_lines([line], [0])[0]
+
+    def parse_particle_lines(self, lines, vtx_out_barcodes, energy_multiplier=1.):
+        """Parse a block of HepMC GenParticle lines and return EdgeParticle objects.
+
+        Rather than handling each line in turn, all lines are split up front,
+        and then each column is converted in one go.
+
+        Parameters
+        ----------
+        lines : list[bytes], list[str]
+            GenParticle lines, either as read from file in binary mode, or decoded
+        vtx_out_barcodes : list[int]
+            Barcode of the vertex each particle is outgoing from,
+            in the same order as `lines`
+        energy_multiplier : float, optional
+            Factor to convert energies & momenta to GeV
+
+        Returns
+        -------
+        list[EdgeParticle]
+
+        Raises
+        ------
+        ValueError
+            If a line has fewer fields than a GenParticle needs
+        """
+        if not lines:
+            return []
+
+        # fields: barcode, pdgid, px, py, pz, energy, mass, status,
+        # pol_theta, pol_phi, vtx_in_barcode
+        rows = [line.split(None, 12)[1:12] for line in lines]
+        # zip would silently truncate every column to the shortest row
+        for line, row in zip(lines, rows):
+            if len(row) < 11:
+                raise ValueError("Too few fields in GenParticle line: %r" % (line,))
+        columns = list(zip(*rows))
+
+        def _energy_column(col):
+            if energy_multiplier == 1.:
+                return map(float, col)
+            return [float(x) * energy_multiplier for x in col]
+
+        barcodes = map(int, columns[0])
+        pdgids = map(int, columns[1])
+        pxs, pys, pzs, energies, masses = [_energy_column(col) for col in columns[2:7]]
+        statuses = map(int, columns[7])
+        vtx_in_barcodes = [abs(int(x)) for x in columns[10]]
+
+        edge_particles = [
+            EdgeParticle(particle=Particle(barcode=barcode, pdgid=pdgid, status=status,
+                                           px=px, py=py, pz=pz, energy=energy, mass=mass),
+                         vtx_in_barcode=vtx_in_barcode,
+                         vtx_out_barcode=vtx_out_barcode)
+            for (barcode, pdgid, px, py, pz, energy, mass, status,
+                 vtx_in_barcode, vtx_out_barcode)
+            in zip(barcodes, pdgids, pxs, pys, pzs, energies, masses, statuses,
+                   vtx_in_barcodes, vtx_out_barcodes)
+        ]
+        return edge_particles
 
     def parse_units_line(self, line):
         """Parse units specification line.
@@ -206,6 +258,8 @@ class GenVertex(object):
     Use a namedtuple instead?
     """
 
+    __slots__ = ('barcode', 'n_orphan_in')
+
     def __init__(self, barcode, n_orphan_in=0):
         self.barcode = int(barcode)
         self.n_orphan_in = n_orphan_in
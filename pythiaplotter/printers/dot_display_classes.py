@@ -6,6 +6,7 @@ method for the particle?
 
 
 from __future__ import absolute_import
+from numbers import Integral
 from pythiaplotter.utils.logging_config import get_logger
 from pythiaplotter.utils.pdgid_converter import pdgid_to_string
 from pythiaplotter.utils.common import generate_repr_str, check_representation_str
@@ -41,7 +42,8 @@ def get_particle_label(particle, representation, label_opts, fancy=True):
     check_representation_str(representation)
     style_key = "fancy" if fancy else "plain"
     label = label_opts[representation.lower()][style_key].format(**particle.__dict__)
-    if fancy:
+    # Most labels don't contain inf, so avoid copying them
+    if fancy and "inf" in label:
         label = label.replace("inf", "&#x221e;")
     return label
 
@@ -49,35 +51,123 @@ def get_particle_label(particle, representation, label_opts, fancy=True):
 class DotAttrGenerator(object):
     """Base class for generating particle attr dicts"""
 
-    def __init__(self, particle_opts=None, label_opts=None):
+    # Particle representation this generator makes attributes for, set by subclasses
+    representation = None
+
+    def __init__(self, particle_opts=None, label_opts=None, validate_opts=True):
         """Create Graphviz attribute str for an object that may or may not correspond to a Particle.
 
         Parameters
         ----------
         particle_opts : list[dict]
-            List of style option dicts for particles, each with `filter` and `attr` fields.
+            List of style option dicts for particles, each with `filter` (or `pdgid`)
+            and `attr` fields. The first matching option is used.
         label_opts : dict
             Dict of label templates, for node/edge and fancy/plain.
+        validate_opts : bool, optional
+            If True, check each of `particle_opts` with ``validate_particle_opt()``.
+            Can be turned off if they have already been validated.
         """
-        self.particle_opts = particle_opts
-        if self.particle_opts:
+        self.particle_opts = particle_opts or []
+        if validate_opts:
             for op in self.particle_opts:
                 self.validate_particle_opt(op)
         self.label_opts = label_opts
 
+        # Resolve the label templates for this representation once,
+        # rather than for every particle
+        self._label_fmts = {}
+        if self.label_opts and self.representation:
+            check_representation_str(self.representation)
+            rep_label_opts = self.label_opts[self.representation.lower()]
+            self._label_fmts = {True: rep_label_opts["fancy"], False: rep_label_opts["plain"]}
+
+        # Most particles share one of a few style dicts, so cache their string form
+        self._gv_str_cache = {}
+
+        # Options that select by PDGID can be looked up directly, rather than
+        # calling their filter for every particle. Store the index of the first
+        # such option for each |PDGID|, so that any filter options before it
+        # still take precedence, and only those have to be tried.
+        self._pdgid_opt_index = {}
+        self._filter_opts = []
+        for ind, op in enumerate(self.particle_opts):
+            if 'pdgid' in op:
+                for pdgid in op['pdgid']:
+                    self._pdgid_opt_index.setdefault(abs(pdgid), ind)
+            else:
+                self._filter_opts.append((ind, op))
+
     def __repr__(self):
         return generate_repr_str(self)
 
     @staticmethod
     def validate_particle_opt(opt):
-        """Validate particle options dict"""
-        for key in ['filter', 'attr']:
-            if key not in opt:
-                raise KeyError("Key '%s' must be in particle options dict" % key)
+        """Validate particle options dict
+
+        Raises
+        ------
+        KeyError
+            If a required key is missing, or both 'filter' and 'pdgid' are set
+        TypeError
+            If 'pdgid' is not a list of ints
+        """
+        if 'filter' not in opt and 'pdgid' not in opt:
+            raise KeyError("Key 'filter' or 'pdgid' must be in particle options dict")
+        if 'filter' in opt and 'pdgid' in opt:
+            raise KeyError("Only one of keys 'filter' and 'pdgid' can be in particle options dict")
+        if 'pdgid' in opt:
+            pdgids = opt['pdgid']
+            if (not isinstance(pdgids, (list, tuple)) or
+                    not all(isinstance(p, Integral) and not isinstance(p, bool) for p in pdgids)):
+                raise TypeError("Particle options dict['pdgid'] must be a list of ints, got %r"
+                                % (pdgids,))
+        if 'attr' not in opt:
+            raise KeyError("Key 'attr' must be in particle options dict")
         for key in ['node', 'edge']:
             if key not in opt['attr']:
                 raise KeyError("Key '%s' must be in particle options dict['attr']" % key)
 
+    def get_particle_label(self, particle, fancy):
+        """Return string for particle label, as for ``get_particle_label()``.
+
+        Parameters
+        ----------
+        particle : Particle
+        fancy : bool
+            If True, will use HTML/unicode in labels
+
+        Returns
+        -------
+        str
+        """
+        label = self._label_fmts[fancy].format(**particle.__dict__)
+        if fancy and "inf" in label:
+            label = label.replace("inf", "&#x221e;")
+        return label
+
+    def get_particle_opt(self, particle):
+        """Get the first particle options dict that matches the particle.
+
+        Parameters
+        ----------
+        particle : Particle
+
+        Returns
+        -------
+        dict or None
+            None if no options match.
+        """
+        pdgid_ind = self._pdgid_opt_index.get(abs(particle.pdgid), len(self.particle_opts))
+        for ind, opt in self._filter_opts:
+            if ind > pdgid_ind:
+                break
+            if opt['filter'](particle):
+                return opt
+        if pdgid_ind < len(self.particle_opts):
+            return self.particle_opts[pdgid_ind]
+        return None
+
     def gv_str(self, obj, fancy):
         """Create attribute string for obj.
 
@@ -91,7 +181,7 @@ class DotAttrGenerator(object):
         fancy : bool
             Whether to style plain or fancy
         """
-        if 'particle' in list(obj.keys()):
+        if 'particle' in obj:
             attr = self.get_particle_attr(obj['particle'], fancy)
         else:
             attr = self.get_non_particle_attr(obj, fancy)
@@ -135,44 +225,64 @@ class DotAttrGenerator(object):
         return {}
 
     def dict_to_gv_str(self, attr_dict):
-        """Convert a dict to a graphviz-legal string."""
+        """Convert a dict to a graphviz-legal string.
+
+        Labels are unique to each particle, so are put first, and the rest of
+        the string is cached.
+        """
         if not attr_dict:
             return ""
-        attr_list = ['{0}={1}'.format(*it) for it in attr_dict.items()]
-        return "[{0}]".format(", ".join(attr_list))
+        style_items = tuple((k, v) for k, v in attr_dict.items() if k != "label")
+        try:
+            style_str = self._gv_str_cache.get(style_items)
+            cacheable = True
+        except TypeError:
+            # an unhashable value (e.g. a list from a user config) can't be cached
+            style_str, cacheable = None, False
+        if style_str is None:
+            style_str = ", ".join(['%s=%s' % it for it in style_items])
+            if cacheable:
+                self._gv_str_cache[style_items] = style_str
+        if "label" not in attr_dict:
+            return "[%s]" % style_str
+        if not style_str:
+            return "[label=%s]" % attr_dict["label"]
+        return "[label=%s, %s]" % (attr_dict["label"], style_str)
 
 
 class DotEdgeAttrGenerator(DotAttrGenerator):
     """AttrGenerator specifically for Edges."""
 
-    def __init__(self, particle_opts, label_opts):
-        super(DotEdgeAttrGenerator, self).__init__(particle_opts, label_opts)
+    representation = "EDGE"
+
+    def __init__(self, particle_opts, label_opts, validate_opts=True):
+        super(DotEdgeAttrGenerator, self).__init__(particle_opts, label_opts, validate_opts)
 
     def get_particle_attr(self, particle, fancy):
-        attr = {"label": get_particle_label(particle, "EDGE", self.label_opts, fancy)}
+        attr = {"label": self.get_particle_label(particle, fancy)}
 
-        for opt in self.particle_opts:
-            if opt['filter'](particle):
-                attr.update(opt['attr']['edge'])
-                break
+        opt = self.get_particle_opt(particle)
+        if opt:
+            attr.update(opt['attr']['edge'])
         return attr
 
 class DotNodeAttrGenerator(DotAttrGenerator):
     """AttrGenerator specifically for Nodes."""
 
-    def __init__(self, particle_opts, label_opts):
-        super(DotNodeAttrGenerator, self).__init__(particle_opts, label_opts)
+    representation = "NODE"
+
+    def __init__(self, particle_opts, label_opts, validate_opts=True):
+        super(DotNodeAttrGenerator, self).__init__(particle_opts, label_opts, validate_opts)
 
     def __repr__(self):
         return generate_repr_str(self)
 
     def get_particle_attr(self, particle, fancy):
-        attr = {"label": get_particle_label(particle, "NODE", self.label_opts, fancy)}
+        attr = {"label": self.get_particle_label(particle, fancy)}
 
-        for opt in self.particle_opts:
-            if opt['filter'](particle):
-                attr.update(opt['attr']['node'])
-                break
+        opt = self.get_particle_opt(particle)
+        if opt:
+            attr.update(opt['attr']['node'])
         return attr
 
     def get_non_particle_attr(self, obj, fancy):
@@ -184,8 +294,17 @@ class DotGraphAttrGenerator(DotAttrGenerator):
 
     def __init__(self, attr):
         self.attr = attr
+        self._gv_str = None
 
     def gv_str(self):
-        """Print graph attributes in dot-friendly format"""
-        attr_list = ['{0}={1};'.format(*it) for it in self.attr.items()]
-        return "\n".join(attr_list)
+        """Print graph attributes in dot-friendly format.
+
+        The string is only made once, so the attributes shouldn't be
+        modified after the first call.
+        """
+        if self._gv_str is None:
+            attr_list = ['{0}={1};'.format(*it) for it in self.attr.items()]
+            self._gv_str = "\n".join(attr_list)
+        return self._gv_str
+
+    __str__ = gv_str
@@ -13,7 +13,7 @@ Several stages:
 from __future__ import absolute_import
 import os
 from string import Template
-from subprocess import call, PIPE, Popen
+from subprocess import PIPE, Popen
 from pythiaplotter.utils.logging_config import get_logger
 from pythiaplotter.utils.common import generate_repr_str
 from .dot_display_classes import DotNodeAttrGenerator, DotEdgeAttrGenerator, DotGraphAttrGenerator
@@ -59,7 +59,9 @@ class DotPrinter(object):
             self.gv_filename = None
         self.graph_attr_gen = DotGraphAttrGenerator(opts.GRAPH_OPTS)
         self.node_attr_gen = DotNodeAttrGenerator(opts.DOT_PARTICLE_OPTS, opts.DOT_LABEL_OPTS)
-        self.edge_attr_gen = DotEdgeAttrGenerator(opts.DOT_PARTICLE_OPTS, opts.DOT_LABEL_OPTS)
+        # same particle options, so no need to validate them again
+        self.edge_attr_gen = DotEdgeAttrGenerator(opts.DOT_PARTICLE_OPTS, opts.DOT_LABEL_OPTS,
+                                                  validate_opts=False)
 
     def __repr__(self):
         return generate_repr_str(self)
@@ -103,11 +105,15 @@ class DotPrinter(object):
         graph = event.graph
         graph.graph["attr"] = self.graph_attr_gen.gv_str()
 
-        for _, node_data in list(graph.nodes(data=True)):
-            node_data["attr"] = self.node_attr_gen.gv_str(node_data, fancy)
+        # Only the data dicts are modified, not the graph structure,
+        # so there's no need to take a copy of the nodes/edges first
+        node_gv_str = self.node_attr_gen.gv_str
+        for _, node_data in graph.nodes(data=True):
+            node_data["attr"] = node_gv_str(node_data, fancy)
 
-        for _, _, edge_data in list(graph.edges(data=True)):
-            edge_data["attr"] = self.edge_attr_gen.gv_str(edge_data, fancy)
+        edge_gv_str = self.edge_attr_gen.gv_str
+        for _, _, edge_data in graph.edges(data=True):
+            edge_data["attr"] = edge_gv_str(edge_data, fancy)
 
 
 def construct_gv_full(event):
@@ -123,31 +129,28 @@ def construct_gv_full(event):
     """
     graph = event.graph
 
-    # Header-type info with graph-wide settings
+    # Header-type info with graph-wide settings.
+    # Fill in its template with any event data, e.g. title & source.
+    # This is only needed for the header, so avoids scanning over
+    # every node & edge line.
     gv_str = ["digraph g {"]
-    gv_str.append("{attr}".format(**graph.graph))
+    gv_str.append(Template(str(graph.graph["attr"])).safe_substitute(event.__dict__))
 
     # Write all the nodes to file, with their display attributes
-    for node, node_data in list(graph.nodes(data=True)):
-        gv_str.append("{0} {attr};".format(node, **node_data))
+    gv_str.extend("%s %s;" % (node, node_data["attr"])
+                  for node, node_data in graph.nodes(data=True))
 
     # Write all the edges to file, with their display attributes
-    for out_node, in_node, edge_data in list(graph.edges(data=True)):
-        gv_str.append("{0} -> {1} {attr};".format(out_node, in_node, **edge_data))
+    gv_str.extend("%s -> %s %s;" % (out_node, in_node, edge_data["attr"])
+                  for out_node, in_node, edge_data in graph.edges(data=True))
 
-    # Set all initial particles to be level in diagram
-    initial = ' '.join([str(node) for node, node_data
-                        in list(graph.nodes(data=True))
-                        if len(list(graph.predecessors(node))) == 0])
+    # Set all initial particles to be level in diagram.
+    # Check the predecessor dict directly, rather than building a list per node.
+    initial = ' '.join([str(node) for node in graph if not graph.pred[node]])
     gv_str.append("{{rank=same; {0} }}; "
                     "// initial particles on same level".format(initial))
     gv_str.append("}")
-    gv_str = "\n".join(gv_str)
-
-    # Fill in template with any data
-    gv_str = Template(gv_str).safe_substitute(event.__dict__)
-
-    return gv_str
+    return "\n".join(gv_str)
 
 
 def write_gv(gv_str, gv_filename):
@@ -191,27 +194,36 @@ def print_diagram(gv_str, output_filename, renderer, output_format):
     run_cmds = []
 
     if output_format == "ps" or output_format == "ps2":
-        # Do 2 stages: make a PostScript file, then convert to PDF.
-        ps_filename = os.path.splitext(output_filename)[0] + ".ps"
-
+        # Make a PostScript file, which can then be converted to PDF.
         if output_format == "ps":  # hmm or should we get user to do this
             output_format += ":cairo"
 
-        dot_args = [renderer, "-T" + output_format, "-o", ps_filename]
-        run_cmds.append(" ".join(dot_args))
-        p = Popen(dot_args, stdin=PIPE, stderr=PIPE)
-        out, err = p.communicate(input=gv_str.encode())
-        if p.returncode != 0:
-            raise RuntimeError(err)
-
         if output_filename.endswith(".pdf"):
-            pdfargs = ["ps2pdf", ps_filename, output_filename]
-            run_cmds.append(' '.join(pdfargs))
-            call(pdfargs)
-
-            rmargs = ["rm", ps_filename]
-            run_cmds.append(' '.join(rmargs))
-            call(rmargs)
+            # Pipe the PostScript straight into ps2pdf, rather than
+            # writing it to an intermediate file, and deleting it afterwards
+            dot_args = [renderer, "-T" + output_format]
+            pdf_args = ["ps2pdf", "-", output_filename]
+            run_cmds.append(" ".join(dot_args) + " | " + " ".join(pdf_args))
+            p_dot = Popen(dot_args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+            p_pdf = Popen(pdf_args, stdin=p_dot.stdout, stderr=PIPE)
+            # ps2pdf now owns the read end of the pipe,
+            # so communicate() shouldn't try and read from it
+            p_dot.stdout.close()
+            p_dot.stdout = None
+            out, err = p_dot.communicate(input=gv_str.encode())
+            out, pdf_err = p_pdf.communicate()
+            if p_dot.returncode != 0:
+                raise RuntimeError(err)
+            if p_pdf.returncode != 0:
+                raise RuntimeError(pdf_err)
+        else:
+            ps_filename = os.path.splitext(output_filename)[0] + ".ps"
+            dot_args = [renderer, "-T" + output_format, "-o", ps_filename]
+            run_cmds.append(" ".join(dot_args))
+            p = Popen(dot_args, stdin=PIPE, stderr=PIPE)
+            out, err = p.communicate(input=gv_str.encode())
+            if p.returncode != 0:
+                raise RuntimeError(err)
 
     elif output_format is not None:
         dot_args = [renderer, "-T" + output_format, "-o", output_filename]
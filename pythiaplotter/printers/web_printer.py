@@ -12,6 +12,11 @@ from __future__ import absolute_import, print_function
 import json
 from string import Template
 from subprocess import PIPE, Popen
+from threading import Thread
+try:
+    import orjson  # much faster JSON encoding for large events
+except ImportError:
+    orjson = None
 from pkg_resources import resource_filename
 from pythiaplotter.utils.logging_config import get_logger
 from pythiaplotter.utils.common import generate_repr_str
@@ -21,8 +26,17 @@ from pythiaplotter.utils.pdgid_converter import pdgid_to_string
 log = get_logger(__name__)
 
 
+# Split templates, keyed by filename, so each is only read & scanned once
+_template_cache = {}
+
+# Package resource file contents, keyed by resource name
+_resource_cache = {}
+
+
 class VisPrinter(object):
 
+    __slots__ = ('output_filename', 'renderer', 'graph_opts')
+
     def __init__(self, opts):
         """
         Parameters
@@ -57,25 +71,28 @@ class VisPrinter(object):
 
         gv_str = construct_gv_only_edges(event.graph, self.graph_opts)
 
-        raw_json = get_dot_json(gv_str, self.renderer)
+        # Do the work that doesn't need node positions while the layout is
+        # calculated. Don't leave the renderer running if anything fails.
+        dot = DotRunner(gv_str, self.renderer)
+        try:
+            vis_node_dicts, vis_edge_dicts = create_vis_dicts(event.graph)
 
-        add_node_positions(event.graph, raw_json)
+            pythia8status = read_resource('particledata/pythia8status.json')
 
-        vis_node_dicts, vis_edge_dicts = create_vis_dicts(event.graph)
+            raw_json = dot.result()
+        finally:
+            dot.stop()
 
-        pythia8status_file = resource_filename('pythiaplotter',
-                                               'particledata/pythia8status.json')
-        with open(pythia8status_file) as f:
-            pythia8status = f.read()
+        add_node_positions(event.graph, raw_json)
 
-        dkwargs = dict(indent=None, sort_keys=True)
+        add_vis_node_positions(vis_node_dicts, event.graph)
 
         field_data = dict(
             title=event.title,
             inputfile=event.source,
             eventnum=event.event_num,
-            nodedata=json.dumps(vis_node_dicts, **dkwargs),
-            edgedata=json.dumps(vis_edge_dicts, **dkwargs),
+            nodedata=_dump_json(vis_node_dicts),
+            edgedata=_dump_json(vis_edge_dicts),
             pythia8status=pythia8status
         )
 
@@ -83,6 +100,47 @@ class VisPrinter(object):
         write_webpage(field_data, self.output_filename)
 
 
+def read_resource(resource_name):
+    """Get the contents of a package resource file, only reading it the first time.
+
+    Parameters
+    ----------
+    resource_name : str
+        Resource path relative to the pythiaplotter package
+
+    Returns
+    -------
+    bytes
+    """
+    if resource_name not in _resource_cache:
+        with open(resource_filename('pythiaplotter', resource_name), 'rb') as f:
+            _resource_cache[resource_name] = f.read()
+    return _resource_cache[resource_name]
+
+
+def _dump_json(obj):
+    """Serialise `obj` as compact JSON with sorted keys.
+
+    Uses orjson if available, which returns UTF-8 bytes ready for the webpage,
+    otherwise falls back to the standard json module and returns a str.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'))
+
+
+def _load_json(raw_json):
+    """Parse JSON from a str or UTF-8 bytes.
+
+    Uses orjson if available, otherwise falls back to the standard json module.
+    """
+    if orjson is not None:
+        return orjson.loads(raw_json)
+    if isinstance(raw_json, bytes):
+        raw_json = raw_json.decode('utf-8')
+    return json.loads(raw_json)
+
+
 def construct_gv_only_edges(graph, graph_attr=None):
     """Create a graph in DOT language with just edges specified.
 
@@ -102,39 +160,107 @@ def construct_gv_only_edges(graph, graph_attr=None):
     """
     gv_str = ["digraph g{"]
     if graph_attr:
-        for k, v in graph_attr.items():
-            gv_str.append("{}={};".format(k, v))
-    for out_node, in_node in list(graph.edges(data=False)):
-        gv_str.append("{0} -> {1};".format(out_node, in_node))
-    initial = ' '.join([str(node) for node, node_data
-                        in list(graph.nodes(data=True))
-                        if len(list(graph.predecessors(node))) == 0])
-    gv_str.append("{{rank=same; {0} }};".format(initial))
+        gv_str.extend("%s=%s;" % (k, v) for k, v in graph_attr.items())
+    gv_str.extend("%s -> %s;" % edge for edge in graph.edges())
+    initial = ' '.join([str(node) for node in graph if not graph.pred[node]])
+    gv_str.append("{rank=same; %s };" % initial)
     gv_str.append("}")
     return "".join(gv_str)
 
 
+class DotRunner(object):
+    """Run a layout renderer on a graph in the background.
+
+    The graph is sent as soon as the renderer starts, and a thread collects
+    its output, so the layout is calculated while other work is done.
+    Call `stop` if `result` isn't reached, so the renderer isn't left running.
+    """
+
+    __slots__ = ('process', '_thread', '_output', '_error')
+
+    def __init__(self, graphviz_str, renderer="dot"):
+        """
+        Parameters
+        ----------
+        graphviz_str : str or bytes
+            Graph in DOT language. A str is sent UTF-8 encoded.
+        renderer : str, optional
+            Renderer to use. Default is dot.
+        """
+        if not isinstance(graphviz_str, bytes):
+            graphviz_str = graphviz_str.encode('utf-8')
+        self.process = Popen([renderer, "-Tjson0"], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        self._output = None
+        self._error = None
+        # communicate() writes & reads together, so large graphs can't deadlock the pipes
+        self._thread = Thread(target=self._communicate, args=(graphviz_str,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __repr__(self):
+        return generate_repr_str(self)
+
+    def _communicate(self, graphviz_str):
+        try:
+            self._output = self.process.communicate(input=graphviz_str)
+        except Exception as err:  # re-raised by result()
+            self._error = err
+
+    def result(self):
+        """Wait for the renderer to finish, and get its JSON output.
+
+        Returns
+        -------
+        bytes
+            JSON output, UTF-8 encoded
+
+        Raises
+        ------
+        RuntimeError
+            If the renderer fails
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        out, err = self._output
+        if self.process.returncode != 0:
+            raise RuntimeError(err)
+        return out
+
+    def stop(self):
+        """Kill the renderer if it is still running."""
+        if self.process.poll() is None:
+            self.process.kill()
+        self._thread.join()
+
+
 def get_dot_json(graphviz_str, renderer="dot"):
     """Get the JSON output (with co-ords) from running a layout renderer.
 
     Parameters
     ----------
-    graphviz_str : str
-        Graph in DOT language.
+    graphviz_str : str or bytes
+        Graph in DOT language. A str is sent UTF-8 encoded.
     renderer : str, optional
         Renderer to use. Default is dot.
 
     Returns
     -------
-    str
-        JSON string
+    bytes
+        JSON output, UTF-8 encoded
+
+    Raises
+    ------
+    RuntimeError
+        If the renderer fails
     """
-    dot_args = [renderer, "-Tjson0"]
-    p = Popen(dot_args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-    out, err = p.communicate(input=graphviz_str.encode())
+    if not isinstance(graphviz_str, bytes):
+        graphviz_str = graphviz_str.encode('utf-8')
+    p = Popen([renderer, "-Tjson0"], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    out, err = p.communicate(input=graphviz_str)
     if p.returncode != 0:
         raise RuntimeError(err)
-    return out.decode()
+    return out
 
 
 def add_node_positions(graph, raw_json):
@@ -144,26 +270,61 @@ def add_node_positions(graph, raw_json):
     ----------
     graph : NetworkX.MultiDiGraph
         Graph to be updated
-    raw_json : str
+    raw_json : str or bytes
         JSON with nodes & their positions
     """
-    gv_dict = json.loads(raw_json)
+    gv_dict = _load_json(raw_json)
+
+    # map of node to its attribute dict, so updating these updates the graph
+    node_attrs = dict(graph.nodes(data=True))
 
     # add node positions.
     for obj in gv_dict['objects']:
         # skip not proper nodes
         if 'nodes' in obj:
             continue
-        barcode = int(obj['name'])
-        x, y = obj['pos'].split(',')
-        x, y = float(x), float(y)
-        graph.node[barcode]['pos'] = (x, y)
+        x, _, y = obj['pos'].partition(',')
+        node_attrs[int(obj['name'])]['pos'] = (float(x), float(y))
+
+
+def _generate_particle_opts(particle, pdgid_names):
+    """Create a dict of vis.js options for a particle.
+
+    Parameters
+    ----------
+    particle : Particle
+    pdgid_names : dict
+        {PDGID: name} cache of particle names, updated with any new PDGIDs
+
+    Returns
+    -------
+    dict
+    """
+    if particle.pdgid not in pdgid_names:
+        pdgid_names[particle.pdgid] = pdgid_to_string(particle.pdgid)
+    name = pdgid_names[particle.pdgid]
+    pd = {
+        'label': name,
+        'name': name,
+        'title': "",  # does tooltip, control in webpage itself
+        'group': "default"
+    }
+    # format a copy, so as not to turn the particle's own fields into strings
+    pd.update({k: ("%.3g" % v if isinstance(v, float) else v)
+               for k, v in particle.__dict__.items()})
+    if particle.initial_state:
+        pd['group'] = 'initial'
+    if particle.final_state:
+        pd['group'] = 'final'
+    pd['originalGroup'] = pd['group']
+    return pd
 
 
 def create_vis_dicts(graph):
     """Create list of dicts for nodes & edges suitable for input to vis.js
 
-    This includes node position, label, hover info, etc
+    This includes label, hover info, etc. Node positions are added
+    separately by `add_vis_node_positions`, once the layout is done.
 
     Parameters
     ----------
@@ -174,65 +335,145 @@ def create_vis_dicts(graph):
     list[dict], list[dict]
         Lists of dicts corresponding to (nodes, edges)
     """
-    def _generate_particle_opts(particle):
-        pd = {
-            'label': pdgid_to_string(particle.pdgid),
-            'name': pdgid_to_string(particle.pdgid),
-            'title': "",  # does tooltip, control in webpage itself
-            'group': "default"
-        }
-        attr = particle.__dict__
-        for k, v in attr.items():
-            if isinstance(v, float):
-                attr[k] = "%.3g" % v
-        pd.update(**attr)
-        if particle.initial_state:
-            pd['group'] = 'initial'
-        if particle.final_state:
-            pd['group'] = 'final'
-        pd['originalGroup'] = pd['group']
-        return pd
+    # many more particles than distinct PDGIDs, so only look up each name once
+    pdgid_names = {}
 
     node_dicts = []
-    for node, node_data in list(graph.nodes(data=True)):
+    add_node_dict = node_dicts.append
+    for node, node_data in graph.nodes(data=True):
         nd = {
             "id": node,
-            "label": "",
-            "x": node_data['pos'][0],
-            "y": node_data['pos'][1]
+            "label": ""
         }
         if 'particle' in node_data:
-            nd.update(_generate_particle_opts(node_data['particle']))
-        node_dicts.append(nd)
+            nd.update(_generate_particle_opts(node_data['particle'], pdgid_names))
+        add_node_dict(nd)
 
     edge_dicts = []
-    for out_vtx, in_vtx, edge_data in list(graph.edges(data=True)):
+    add_edge_dict = edge_dicts.append
+    for out_vtx, in_vtx, edge_data in graph.edges(data=True):
         ed = {"from": out_vtx, "to": in_vtx}
         if 'particle' in edge_data:
-            ed.update(_generate_particle_opts(edge_data['particle']))
-        edge_dicts.append(ed)
+            ed.update(_generate_particle_opts(edge_data['particle'], pdgid_names))
+        add_edge_dict(ed)
 
     return node_dicts, edge_dicts
 
 
+def add_vis_node_positions(node_dicts, graph):
+    """Add node positions to the vis.js node dicts from `create_vis_dicts`.
+
+    Parameters
+    ----------
+    node_dicts : list[dict]
+        Node dicts to be updated
+    graph : NetworkX.MultiDiGraph
+        Graph whose nodes have had their positions set by `add_node_positions`
+    """
+    positions = {node: node_data['pos'] for node, node_data in graph.nodes(data=True)}
+    for nd in node_dicts:
+        nd['x'], nd['y'] = positions[nd['id']]
+
+
+def load_template(template_file):
+    """Read a template file and split it around its placeholders.
+
+    Placeholders follow the `string.Template` syntax: ``$field`` and ``${field}``
+    are fields, ``$$`` is a literal ``$``, and any other ``$`` is left as it is.
+    The result is cached, so repeated calls do not re-read the file.
+
+    Parameters
+    ----------
+    template_file : str
+        Template filename (UTF-8 encoded)
+
+    Returns
+    -------
+    list[(bytes, str, bytes)]
+        (literal segment, field name following it, placeholder text) triples.
+        The field name & placeholder are None for the final segment.
+    """
+    if template_file not in _template_cache:
+        with open(template_file, 'rb') as f:
+            text = f.read().decode('utf-8')
+        parts = []
+        literal = []
+        pos = 0
+        for mo in Template.pattern.finditer(text):
+            literal.append(text[pos:mo.start()])
+            pos = mo.end()
+            field = mo.group('named') or mo.group('braced')
+            if field is None:
+                # $$ becomes $, an invalid placeholder stays as it is
+                literal.append(mo.group('escaped') or mo.group())
+                continue
+            parts.append(("".join(literal).encode('utf-8'), field, mo.group().encode('utf-8')))
+            literal = []
+        literal.append(text[pos:])
+        parts.append(("".join(literal).encode('utf-8'), None, None))
+        _template_cache[template_file] = parts
+    return _template_cache[template_file]
+
+
+def _field_bytes(value):
+    """Convert a template field value to UTF-8 bytes."""
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, type(u"")):
+        value = "%s" % (value,)
+    return value.encode('utf-8')
+
+
+def fill_template(template_file, field_data):
+    """Fill in a template file's fields, as `string.Template.safe_substitute` does.
+
+    Placeholders for fields not in `field_data` are left untouched.
+
+    Parameters
+    ----------
+    template_file : str
+        Template filename
+    field_data : dict
+        Dict of template {field name: value} to be replaced.
+        bytes values are inserted as they are, others are UTF-8 encoded.
+
+    Returns
+    -------
+    bytes
+    """
+    page = []
+    add_piece = page.append
+    for segment, field, placeholder in load_template(template_file):
+        add_piece(segment)
+        if field is None:
+            continue
+        if field in field_data:
+            add_piece(_field_bytes(field_data[field]))
+        else:
+            add_piece(placeholder)
+    return b"".join(page)
+
+
 def write_webpage(field_data, output_filename):
     """Write webpage using template file and filling with user data.
 
+    Fields not in `field_data` are left untouched, as with
+    `string.Template.safe_substitute`.
+
     Parameters
     ----------
     field_data: dict
-        Dict of template {field name: value str} to be replaced
+        Dict of template {field name: value} to be replaced
     output_filename : str
         Output HTML filename
     """
     template_file = resource_filename('pythiaplotter',
                                       'printers/templates/vis_template.html')
-    with open(template_file, "r") as f:
-        template = f.read()
 
-    template = Template(template).safe_substitute(field_data)
+    page = fill_template(template_file, field_data)
 
-    with open(output_filename, 'w') as f:
-        f.write(template)
+    # write the whole page at once
+    with open(output_filename, 'wb') as f:
+        f.write(page)
 
     log.info("Webpage written to %s", output_filename)
@@ -84,7 +84,9 @@ def map_columns_to_dict(fields, line, delim=None):
     dict {str:str}
         Dict of field names: values
     """
-    parts = line.strip().split(delim)[0:len(fields) + 1]
+    # Only split off as many columns as needed, rather than splitting the
+    # whole line and discarding the rest
+    parts = line.strip().split(delim, len(fields))
     return {k: v.strip() for k, v in izip(fields, parts)}
 
 
@@ -142,7 +144,12 @@ def generate_repr_str(obj, ignore=None):
         The repr string
     """
     ignore = ignore or []
-    args_str = ["%s=%s" % (k, repr(obj.__dict__[k])) for k in obj.__dict__ if k not in ignore]
+    if hasattr(obj, "__dict__"):
+        fields = list(obj.__dict__.items())
+    else:
+        # classes using __slots__ have no __dict__
+        fields = [(k, getattr(obj, k)) for k in obj.__slots__]
+    args_str = ["%s=%s" % (k, repr(v)) for k, v in fields if k not in ignore]
     return "{}({})".format(obj.__class__.__name__, ", ".join(args_str))
 
 
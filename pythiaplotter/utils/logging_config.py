@@ -26,15 +26,19 @@ class LevelFormatter(logging.Formatter):
             for level, fmt_level in level_fmts.items():
                 # Could optionally support level names too
                 self._level_formatters[level] = logging.Formatter(fmt=fmt_level, datefmt=datefmt)
+        # Used for any levels without their own format
+        self._default_formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
         # self._fmt will be the default format
         super(LevelFormatter, self).__init__(fmt=fmt, datefmt=datefmt)
 
     def format(self, record):
-        if record.levelno in self._level_formatters:
-            return self._level_formatters[record.levelno].format(record)
+        return self._level_formatters.get(record.levelno, self._default_formatter).format(record)
 
-        return super(LevelFormatter, self).format(record)
 
+# None of our formats use thread or process info, so don't collect it for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
 formatter = LevelFormatter(fmt='%(message)s',
                            level_fmts={logging.ERROR: '%(levelname)s: %(message)s',
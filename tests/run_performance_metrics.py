@@ -70,7 +70,7 @@ try:
     import ROOT
     test_settings['heppy parser'] = dict(
         stmt='HeppyParser(cf("example/example_heppy.root"), 0).parse()',
-        setup=std_import+"from pythiaplotter.parsers import HeppyParser",
+        setup=std_import+"from pythiaplotter.parsers.heppy_parser import HeppyParser",
         repeat=n_repeat,
         number=n_iter
     )
@@ -0,0 +1,163 @@
+"""Unit tests for dot_display_classes"""
+
+
+from __future__ import absolute_import
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+import pythiaplotter.default_config as dc
+from pythiaplotter.cli import load_default_user_configs
+from pythiaplotter.parsers.event_classes import Particle
+from pythiaplotter.printers.dot_display_classes import DotAttrGenerator, DotNodeAttrGenerator
+
+
+def make_opt(colour, **kwargs):
+    """Make a particle options dict that styles nodes & edges with `colour`"""
+    opt = dict(attr={"node": {"color": colour}, "edge": {"color": colour}})
+    opt.update(kwargs)
+    return opt
+
+
+def get_colour(gen, particle):
+    """Get the node colour from the particle options chosen for `particle`"""
+    opt = gen.get_particle_opt(particle)
+    return opt['attr']['node'].get('color') if opt else None
+
+
+class ParticleOpt_Test(unittest.TestCase):
+    """Test picking particle options with filter and pdgid keys"""
+
+    def test_pdgid_matches_antiparticle(self):
+        gen = DotAttrGenerator([make_opt("red", pdgid=[5])])
+        self.assertEqual(get_colour(gen, Particle(barcode=1, pdgid=5)), "red")
+        self.assertEqual(get_colour(gen, Particle(barcode=2, pdgid=-5)), "red")
+        self.assertIsNone(get_colour(gen, Particle(barcode=3, pdgid=4)))
+
+    def test_first_match_wins(self):
+        """Options are tried in order, whether they use filter or pdgid"""
+        opts = [
+            make_opt("blue", filter=lambda p: p.status == 1),
+            make_opt("red", pdgid=[5, 21]),
+            make_opt("green", pdgid=[5]),
+            make_opt("grey", filter=lambda p: p.pdgid == 21 or p.status == 2),
+        ]
+        gen = DotAttrGenerator(opts)
+        # filter before the pdgid option takes precedence
+        self.assertEqual(get_colour(gen, Particle(barcode=1, pdgid=5, status=1)), "blue")
+        # then the first pdgid option listing it
+        self.assertEqual(get_colour(gen, Particle(barcode=2, pdgid=5, status=2)), "red")
+        self.assertEqual(get_colour(gen, Particle(barcode=3, pdgid=21)), "red")
+        # filter after all pdgid options is still tried
+        self.assertEqual(get_colour(gen, Particle(barcode=4, pdgid=1, status=2)), "grey")
+        self.assertIsNone(get_colour(gen, Particle(barcode=5, pdgid=1)))
+
+    def test_pdgid_before_filter(self):
+        opts = [
+            make_opt("red", pdgid=[5]),
+            make_opt("blue", filter=lambda p: p.status == 1),
+        ]
+        gen = DotAttrGenerator(opts)
+        self.assertEqual(get_colour(gen, Particle(barcode=1, pdgid=5, status=1)), "red")
+        self.assertEqual(get_colour(gen, Particle(barcode=2, pdgid=1, status=1)), "blue")
+
+    def test_validate_filter_or_pdgid(self):
+        with self.assertRaises(KeyError):
+            DotAttrGenerator([dict(attr={"node": {}, "edge": {}})])
+        with self.assertRaises(KeyError):
+            DotAttrGenerator([make_opt("red", pdgid=[5], filter=lambda p: True)])
+
+    def test_validate_pdgid_list(self):
+        for bad_pdgid in [5, "5", [5.0], ["5"], [True], None]:
+            with self.assertRaises(TypeError):
+                DotAttrGenerator([make_opt("red", pdgid=bad_pdgid)])
+        DotAttrGenerator([make_opt("red", pdgid=(5, -6))])
+
+    def test_default_config(self):
+        gen = DotNodeAttrGenerator(dc.DOT_PARTICLE_OPTS, dc.DOT_LABEL_OPTS)
+        self.assertEqual(get_colour(gen, Particle(barcode=1, pdgid=-5)), "red")
+        self.assertEqual(get_colour(gen, Particle(barcode=2, pdgid=15)), "purple")
+        self.assertEqual(get_colour(gen, Particle(barcode=3, pdgid=21)), "grey")
+        # PDGID styles come before the initial/final-state filters
+        self.assertEqual(get_colour(gen, Particle(barcode=4, pdgid=22, final_state=True)),
+                         "cadetblue1")
+        self.assertEqual(get_colour(gen, Particle(barcode=5, pdgid=1, final_state=True)),
+                         "dodgerblue1")
+        # catch-all default has no node colour
+        self.assertIsNone(get_colour(gen, Particle(barcode=6, pdgid=1)))
+
+
+class DictToGvStr_Test(unittest.TestCase):
+    """Test converting attribute dicts to graphviz strings"""
+
+    def setUp(self):
+        self.gen = DotAttrGenerator([make_opt("red", pdgid=[5])])
+
+    def test_label_first(self):
+        self.assertEqual(self.gen.dict_to_gv_str({}), "")
+        self.assertEqual(self.gen.dict_to_gv_str({"label": "b"}), "[label=b]")
+        self.assertEqual(self.gen.dict_to_gv_str({"color": "red"}), "[color=red]")
+        self.assertEqual(self.gen.dict_to_gv_str({"color": "red", "label": "b"}),
+                         "[label=b, color=red]")
+
+    def test_cached(self):
+        """Same styles with different labels give the right strings"""
+        for label in ["b", "g", "b"]:
+            self.assertEqual(self.gen.dict_to_gv_str({"label": label, "color": "red"}),
+                             "[label=%s, color=red]" % label)
+
+    def test_unhashable_value(self):
+        """Values that can't be cached (e.g. lists from a user config) are still formatted"""
+        for _ in range(2):
+            self.assertEqual(self.gen.dict_to_gv_str({"label": "b", "dir": ["both"]}),
+                             "[label=b, dir=%s]" % ["both"])
+
+
+class UserConfig_Test(unittest.TestCase):
+    """Test particle options from a user config file replace the defaults"""
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def load_config(self, contents):
+        config_file = os.path.join(self.config_dir, "user_config.py")
+        with open(config_file, "w") as f:
+            f.write(contents)
+        args = argparse.Namespace(configFile=config_file)
+        load_default_user_configs(args)
+        return args
+
+    def test_user_particle_opts(self):
+        args = self.load_config(
+            'DOT_PARTICLE_OPTS = [\n'
+            '    dict(filter=lambda p: p.status == 1,\n'
+            '         attr={"node": {"color": "blue"}, "edge": {"color": "blue"}}),\n'
+            '    dict(pdgid=[5, 6],\n'
+            '         attr={"node": {"color": "green"}, "edge": {"color": "green"}}),\n'
+            ']\n'
+        )
+        gen = DotNodeAttrGenerator(args.DOT_PARTICLE_OPTS, args.DOT_LABEL_OPTS)
+        self.assertEqual(get_colour(gen, Particle(barcode=1, pdgid=5, status=1)), "blue")
+        self.assertEqual(get_colour(gen, Particle(barcode=2, pdgid=-5, status=2)), "green")
+        # the defaults are replaced, not added to
+        self.assertIsNone(get_colour(gen, Particle(barcode=3, pdgid=21, status=2)))
+
+    def test_user_particle_opts_invalid(self):
+        args = self.load_config(
+            'DOT_PARTICLE_OPTS = [\n'
+            '    dict(pdgid=5, attr={"node": {}, "edge": {}}),\n'
+            ']\n'
+        )
+        with self.assertRaises(TypeError):
+            DotNodeAttrGenerator(args.DOT_PARTICLE_OPTS, args.DOT_LABEL_OPTS)
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -122,6 +122,83 @@ class EdgeGrapher_Test(unittest.TestCase):
         edges = [(-1, -2), (-2, -4), (-2, -3), (-3, -7), (-3, -8)]
         self.check_graph_edges(edges, graph)
 
+    def test_redundant_gluon_chain(self):
+        """Check a chain of same-PDGID particles collapses onto the first one.
+
+        (0)--q1--(1)--g2--(2)--g3--(3)--g4--(4)--u5----(5)
+                                               |
+                                              (4)--ubar6--(6)
+
+        should simplify to
+
+        (0)--q1--(1)--g2--(2)--u5----(5)
+                           |
+                          (2)--ubar6--(6)
+        """
+        q1 = EdgeParticle(particle=Particle(barcode=1, pdgid=1),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        g2 = EdgeParticle(particle=Particle(barcode=2, pdgid=21),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        g3 = EdgeParticle(particle=Particle(barcode=3, pdgid=21),
+                          vtx_out_barcode=2, vtx_in_barcode=3)
+        g4 = EdgeParticle(particle=Particle(barcode=4, pdgid=21),
+                          vtx_out_barcode=3, vtx_in_barcode=4)
+        u5 = EdgeParticle(particle=Particle(barcode=5, pdgid=2),
+                          vtx_out_barcode=4, vtx_in_barcode=5)
+        ubar6 = EdgeParticle(particle=Particle(barcode=6, pdgid=-2),
+                             vtx_out_barcode=4, vtx_in_barcode=6)
+        graph = eg.assign_particles_edges([q1, g2, g3, g4, u5, ubar6])
+        eg.remove_redundant_edges(graph)
+        self.check_graph_edges([(0, 1), (1, 2), (2, 5), (2, 6)], graph)
+        self.check_edge_particles([ep.particle for ep in [q1, g2, u5, ubar6]], graph)
+
+    def test_redundant_several_parents(self):
+        """A particle with more than one parent is never redundant,
+        even if they have the same PDGID.
+
+        (0)--g1--(2)--g3--(3)--u4--(4)
+        (1)--g2--(2)
+        """
+        g1 = EdgeParticle(particle=Particle(barcode=1, pdgid=21),
+                          vtx_out_barcode=0, vtx_in_barcode=2)
+        g2 = EdgeParticle(particle=Particle(barcode=2, pdgid=21),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        g3 = EdgeParticle(particle=Particle(barcode=3, pdgid=21),
+                          vtx_out_barcode=2, vtx_in_barcode=3)
+        u4 = EdgeParticle(particle=Particle(barcode=4, pdgid=2),
+                          vtx_out_barcode=3, vtx_in_barcode=4)
+        particles = [g1, g2, g3, u4]
+        graph = eg.assign_particles_edges(particles)
+        eg.remove_redundant_edges(graph)
+        self.check_graph_edges([(0, 2), (1, 2), (2, 3), (3, 4)], graph)
+        self.check_edge_particles([ep.particle for ep in particles], graph)
+
+    def test_redundant_parallel_edges(self):
+        """Parallel edges between the same vertices count as separate
+        parents/siblings, so are not redundant.
+
+        (0)--g1--(1)--g2--(2)--g4--(3)--u6--(4)
+          |        |
+        (0)--g5--(1)--g3--(2)
+        """
+        g1 = EdgeParticle(particle=Particle(barcode=1, pdgid=21),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        g2 = EdgeParticle(particle=Particle(barcode=2, pdgid=21),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        g3 = EdgeParticle(particle=Particle(barcode=3, pdgid=21),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        g4 = EdgeParticle(particle=Particle(barcode=4, pdgid=21),
+                          vtx_out_barcode=2, vtx_in_barcode=3)
+        g5 = EdgeParticle(particle=Particle(barcode=5, pdgid=21),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        u6 = EdgeParticle(particle=Particle(barcode=6, pdgid=2),
+                          vtx_out_barcode=3, vtx_in_barcode=4)
+        particles = [g1, g2, g3, g4, g5, u6]
+        graph = eg.assign_particles_edges(particles)
+        eg.remove_redundant_edges(graph)
+        self.check_graph_edges([(0, 1), (0, 1), (1, 2), (1, 2), (2, 3), (3, 4)], graph)
+        self.check_edge_particles([ep.particle for ep in particles], graph)
+
     def test_intial_final_state(self):
         """Test whether particles marked as initial/final state correctly
 
@@ -166,6 +243,166 @@ class EdgeGrapher_Test(unittest.TestCase):
         self.check_graph_edges([(0, 1), (1, 3)], g)
         self.check_graph_particles([ep.particle for ep in [p1, p3]], g)
 
+    def check_edge_particles(self, particles, graph):
+        """To test which particles are left on edges (works with parallel edges)"""
+        self.compare_lists(particles, [d['particle'] for _, _, d in graph.edges(data=True)])
+
+    def test_edge_removal_self_loop(self):
+        """Test removing a particle that loops back into its own vertex.
+
+        (0) - p1 -> (1) - p2 -> (1)
+                    (1) - p3 -> (2)
+        becomes
+        (0) - p1 -> (1) - p3 -> (2)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1), vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2), vtx_out_barcode=1, vtx_in_barcode=1)
+        p3 = EdgeParticle(particle=Particle(barcode=3), vtx_out_barcode=1, vtx_in_barcode=2)
+        g = eg.assign_particles_edges([p1, p2, p3])
+        eg.remove_particle_edge(g, (1, 1))
+        self.check_graph_edges([(0, 1), (1, 2)], g)
+        self.check_edge_particles([ep.particle for ep in [p1, p3]], g)
+
+    def test_edge_removal_parallel_self_loops(self):
+        """Test removing one of several particles looping back into the same vertex.
+
+        (0) - p1 -> (1) - p2 -> (1)
+                    (1) - p3 -> (1)
+                    (1) - p4 -> (2)
+        becomes
+        (0) - p1 -> (1) - p2 -> (1)
+                    (1) - p4 -> (2)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1), vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2), vtx_out_barcode=1, vtx_in_barcode=1)
+        p3 = EdgeParticle(particle=Particle(barcode=3), vtx_out_barcode=1, vtx_in_barcode=1)
+        p4 = EdgeParticle(particle=Particle(barcode=4), vtx_out_barcode=1, vtx_in_barcode=2)
+        g = eg.assign_particles_edges([p1, p2, p3, p4])
+        key = [k for _, _, k, d in g.edges(keys=True, data=True) if d['barcode'] == 3][0]
+        eg.remove_particle_edge(g, (1, 1), key)
+        self.check_edge_particles([ep.particle for ep in [p1, p2, p4]], g)
+
+    def test_remove_pdgid_mixed_self_loops(self):
+        """Only the self-loops with the PDGID get removed, not their other parallel self-loops.
+
+        (0) - p1(e) -> (1) - p2(g) -> (1)
+                       (1) - p3(b) -> (1)
+                       (1) - p4(g) -> (1)
+                       (1) - p5(e) -> (2)
+        becomes
+        (0) - p1(e) -> (1) - p3(b) -> (1)
+                       (1) - p5(e) -> (2)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1, pdgid=11),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2, pdgid=21),
+                          vtx_out_barcode=1, vtx_in_barcode=1)
+        p3 = EdgeParticle(particle=Particle(barcode=3, pdgid=-5),
+                          vtx_out_barcode=1, vtx_in_barcode=1)
+        p4 = EdgeParticle(particle=Particle(barcode=4, pdgid=21),
+                          vtx_out_barcode=1, vtx_in_barcode=1)
+        p5 = EdgeParticle(particle=Particle(barcode=5, pdgid=11),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        g = eg.assign_particles_edges([p1, p2, p3, p4, p5])
+        eg.remove_edges_by_pdgid(g, 21, final_state_only=False)
+        self.check_graph_edges([(0, 1), (1, 1), (1, 2)], g)
+        self.check_edge_particles([ep.particle for ep in [p1, p3, p5]], g)
+
+    def test_remove_pdgid_final_state_cascade(self):
+        """Removing final-state particles makes their matching parent final-state,
+        so it also gets removed.
+
+        (0) - p1(e) -> (1) - p2(g) -> (2) - p3(g) -> (3)
+                                      (2) - p4(g) -> (4)
+        becomes
+        (0) - p1(e) -> (1)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1, pdgid=11),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2, pdgid=22),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        p3 = EdgeParticle(particle=Particle(barcode=3, pdgid=22),
+                          vtx_out_barcode=2, vtx_in_barcode=3)
+        p4 = EdgeParticle(particle=Particle(barcode=4, pdgid=22),
+                          vtx_out_barcode=2, vtx_in_barcode=4)
+        g = eg.assign_particles_edges([p1, p2, p3, p4])
+        eg.remove_edges_by_pdgid(g, 22)
+        self.check_graph_edges([(0, 1)], g)
+        self.check_edge_particles([p1.particle], g)
+
+    def test_remove_pdgid_keeps_parent_with_other_child(self):
+        """A matching parent with a non-matching child is not final-state, so is kept.
+
+        (0) - p1(e) -> (1) - p2(g) -> (2) - p3(e) -> (3)
+                                      (2) - p4(g) -> (4)
+        becomes
+        (0) - p1(e) -> (1) - p2(g) -> (2) - p3(e) -> (3)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1, pdgid=11),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2, pdgid=22),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        p3 = EdgeParticle(particle=Particle(barcode=3, pdgid=11),
+                          vtx_out_barcode=2, vtx_in_barcode=3)
+        p4 = EdgeParticle(particle=Particle(barcode=4, pdgid=22),
+                          vtx_out_barcode=2, vtx_in_barcode=4)
+        g = eg.assign_particles_edges([p1, p2, p3, p4])
+        eg.remove_edges_by_pdgid(g, 22)
+        self.check_graph_edges([(0, 1), (1, 2), (2, 3)], g)
+        self.check_edge_particles([ep.particle for ep in [p1, p2, p3]], g)
+
+    def test_remove_pdgid_parallel_siblings(self):
+        """Remove final-state particles that span the same pair of vertices,
+        including the antiparticle.
+
+        (0) - p1(e) -> (1) - p2(g) -> (2)
+                       (1) - p3(g) -> (2)
+                       (1) - p4(mu) -> (3)
+                       (1) - p5(mu+) -> (3)
+        becomes
+        (0) - p1(e) -> (1)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1, pdgid=11),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2, pdgid=22),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        p3 = EdgeParticle(particle=Particle(barcode=3, pdgid=22),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        p4 = EdgeParticle(particle=Particle(barcode=4, pdgid=13),
+                          vtx_out_barcode=1, vtx_in_barcode=3)
+        p5 = EdgeParticle(particle=Particle(barcode=5, pdgid=-13),
+                          vtx_out_barcode=1, vtx_in_barcode=3)
+        particles = [p1, p2, p3, p4, p5]
+        g = eg.assign_particles_edges(particles)
+        eg.remove_edges_by_pdgid(g, 22)
+        self.check_graph_edges([(0, 1), (1, 3), (1, 3)], g)
+        self.check_edge_particles([ep.particle for ep in [p1, p4, p5]], g)
+        eg.remove_edges_by_pdgid(g, 13)
+        self.check_graph_edges([(0, 1)], g)
+        self.check_edge_particles([p1.particle], g)
+
+    def test_remove_pdgid_not_final_state_only(self):
+        """With final_state_only=False, intermediate particles are removed too,
+        and their children rewired to the parent's vertex.
+
+        (0) - p1(e) -> (1) - p2(g) -> (2) - p3(e) -> (3)
+                                      (2) - p4(g) -> (4)
+        becomes
+        (0) - p1(e) -> (1) - p3(e) -> (3)
+        """
+        p1 = EdgeParticle(particle=Particle(barcode=1, pdgid=11),
+                          vtx_out_barcode=0, vtx_in_barcode=1)
+        p2 = EdgeParticle(particle=Particle(barcode=2, pdgid=22),
+                          vtx_out_barcode=1, vtx_in_barcode=2)
+        p3 = EdgeParticle(particle=Particle(barcode=3, pdgid=11),
+                          vtx_out_barcode=2, vtx_in_barcode=3)
+        p4 = EdgeParticle(particle=Particle(barcode=4, pdgid=22),
+                          vtx_out_barcode=2, vtx_in_barcode=4)
+        g = eg.assign_particles_edges([p1, p2, p3, p4])
+        eg.remove_edges_by_pdgid(g, 22, final_state_only=False)
+        self.check_graph_edges([(0, 1), (1, 3)], g)
+        self.check_edge_particles([p1.particle, p3.particle], g)
+
 def main():
     unittest.main()
 
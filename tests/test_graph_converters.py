@@ -26,7 +26,7 @@ class Converter_Tests(unittest.TestCase):
 
     def check_graph_node_particles(self, particles, graph):
         """To test particles were correctly assigned to nodes"""
-        node_particles = [data['particle'] for _, data in graph.nodes_iter(data=True)]
+        node_particles = [data['particle'] for _, data in graph.nodes(data=True)]
         if self.verbose:
             print("User particles:")
             pprint(node_particles)
@@ -36,7 +36,7 @@ class Converter_Tests(unittest.TestCase):
 
     def check_graph_edge_particles(self, particles, graph):
         """To test particles were correctly assigned to edges"""
-        edge_particles = [data['particle'] for _, _, data in graph.edges_iter(data=True)]
+        edge_particles = [data['particle'] for _, _, data in graph.edges(data=True)]
         if self.verbose:
             print("User particles:")
             pprint(particles)
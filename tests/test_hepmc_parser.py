@@ -0,0 +1,66 @@
+"""Unit tests for hepmc_parser"""
+
+
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+from pythiaplotter.parsers.hepmc_parser import HepMCParser
+
+
+HEADER = """HepMC::Version 2.06.08
+HepMC::IO_GenEvent-START_EVENT_LISTING
+E 0 -1 5.09e+01 1.49e-01 7.77e-03 123 0 3 1 2 0 1 1.0e+00
+U GEV MM
+V -1 0 0 0 0 0 0 1 0
+P 1 2212 0 0 6.5e+03 6.5e+03 9.38e-01 4 0 0 -1 0
+V -2 0 0 0 0 0 0 2 0
+"""
+
+FOOTER = """HepMC::IO_GenEvent-END_EVENT_LISTING
+"""
+
+
+class HepMCParser_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+
+    def parse(self, particle_lines):
+        input_file = os.path.join(self.input_dir, "test.hepmc")
+        with open(input_file, "w") as f:
+            f.write(HEADER + particle_lines + FOOTER)
+        return HepMCParser(input_file).parse()
+
+    def test_parse_particles(self):
+        event, edge_particles = self.parse(
+            "P 2 5 1.0e+00 2.0e+00 3.0e+00 1.0e+01 4.8e+00 1 0 0 0 0\n"
+            "P 3 -5 -1.0e+00 -2.0e+00 -3.0e+00 1.0e+01 4.8e+00 1 0 0 0 0\n"
+        )
+        self.assertEqual(event.event_num, 0)
+        self.assertEqual([ep.particle.barcode for ep in edge_particles], [1, 2, 3])
+        self.assertEqual([ep.particle.pdgid for ep in edge_particles], [2212, 5, -5])
+        self.assertEqual([ep.vtx_out_barcode for ep in edge_particles[1:]], [2, 2])
+        self.assertEqual(edge_particles[2].particle.px, -1.)
+        self.assertTrue(edge_particles[2].particle.final_state)
+
+    def test_malformed_particle_line(self):
+        """A short P line is an error, not silently dropped along with the rest"""
+        # missing vtx_in_barcode
+        bad_line = "P 3 -5 -1.0e+00 -2.0e+00 -3.0e+00 1.0e+01 4.8e+00 1 0 0"
+        with self.assertRaises(ValueError) as cm:
+            self.parse(
+                "P 2 5 1.0e+00 2.0e+00 3.0e+00 1.0e+01 4.8e+00 1 0 0 0 0\n" + bad_line + "\n"
+            )
+        self.assertIn(bad_line, str(cm.exception))
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
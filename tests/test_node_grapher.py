@@ -139,6 +139,86 @@ class NodeGrapher_Test(unittest.TestCase):
         self.check_graph_edges([(1, 3)], g)
         self.check_graph_nodes([np.particle for np in [p1, p3]], g)
 
+    def check_node_particles(self, particles, graph):
+        """To test which particles are left on nodes"""
+        self.compare_lists(particles, [d['particle'] for _, d in graph.nodes(data=True)])
+
+    def test_remove_pdgid_final_state_cascade(self):
+        """Removing final-state particles makes their matching parent final-state,
+        so it also gets removed.
+
+        (1:e) -> (2:g) -> (3:g), (4:g)
+        becomes
+        (1:e)
+        """
+        p1 = NodeParticle(particle=Particle(barcode=1, pdgid=11), parent_barcodes=[])
+        p2 = NodeParticle(particle=Particle(barcode=2, pdgid=22), parent_barcodes=[1])
+        p3 = NodeParticle(particle=Particle(barcode=3, pdgid=22), parent_barcodes=[2])
+        p4 = NodeParticle(particle=Particle(barcode=4, pdgid=22), parent_barcodes=[2])
+        g = ng.assign_particles_nodes([p1, p2, p3, p4])
+        ng.remove_nodes_by_pdgid(g, 22)
+        self.check_graph_edges([], g)
+        self.check_node_particles([p1.particle], g)
+
+    def test_remove_pdgid_keeps_parent_with_other_child(self):
+        """A matching parent with a non-matching child is not final-state, so is kept.
+
+        (1:e) -> (2:g) -> (3:e), (4:g)
+        becomes
+        (1:e) -> (2:g) -> (3:e)
+        """
+        p1 = NodeParticle(particle=Particle(barcode=1, pdgid=11), parent_barcodes=[])
+        p2 = NodeParticle(particle=Particle(barcode=2, pdgid=22), parent_barcodes=[1])
+        p3 = NodeParticle(particle=Particle(barcode=3, pdgid=11), parent_barcodes=[2])
+        p4 = NodeParticle(particle=Particle(barcode=4, pdgid=-22), parent_barcodes=[2])
+        g = ng.assign_particles_nodes([p1, p2, p3, p4])
+        ng.remove_nodes_by_pdgid(g, 22)
+        self.check_graph_edges([(1, 2), (2, 3)], g)
+        self.check_node_particles([np.particle for np in [p1, p2, p3]], g)
+
+    def test_remove_pdgid_not_final_state_only(self):
+        """With final_state_only=False, intermediate particles are removed too,
+        and their parents rewired to their children.
+
+        (1:e) -> (2:g) -> (3:e), (4:g)
+        becomes
+        (1:e) -> (3:e)
+        """
+        p1 = NodeParticle(particle=Particle(barcode=1, pdgid=11), parent_barcodes=[])
+        p2 = NodeParticle(particle=Particle(barcode=2, pdgid=22), parent_barcodes=[1])
+        p3 = NodeParticle(particle=Particle(barcode=3, pdgid=11), parent_barcodes=[2])
+        p4 = NodeParticle(particle=Particle(barcode=4, pdgid=22), parent_barcodes=[2])
+        g = ng.assign_particles_nodes([p1, p2, p3, p4])
+        ng.remove_nodes_by_pdgid(g, 22, final_state_only=False)
+        self.check_graph_edges([(1, 3)], g)
+        self.check_node_particles([p1.particle, p3.particle], g)
+
+    def test_remove_pdgid_rewired_multiplicity(self):
+        """Matching particles are removed in graph order, which sets how many
+        parallel edges the rewiring leaves.
+
+        (2:e) -> (16:g) -> (14:g) -> (3:e)
+                 (16:g) ----------> (3:e)
+        becomes, removing 14 then 16
+        (2:e) -> (3:e)
+        or, removing 16 then 14
+        (2:e) => (3:e)  (2 parallel edges)
+
+        Graph order is insertion order, except on python 2 where nodes are
+        kept in a plain dict.
+        """
+        p2 = NodeParticle(particle=Particle(barcode=2, pdgid=11), parent_barcodes=[])
+        p3 = NodeParticle(particle=Particle(barcode=3, pdgid=11), parent_barcodes=[16, 14])
+        p14 = NodeParticle(particle=Particle(barcode=14, pdgid=21), parent_barcodes=[16])
+        p16 = NodeParticle(particle=Particle(barcode=16, pdgid=21), parent_barcodes=[2])
+        g = ng.assign_particles_nodes([p2, p3, p14, p16])
+        removal_order = [node for node in g.nodes() if node in (14, 16)]
+        ng.remove_nodes_by_pdgid(g, 21, final_state_only=False)
+        n_edges = 1 if removal_order == [14, 16] else 2
+        self.assertEqual(list(g.edges()), [(2, 3)] * n_edges)
+        self.check_node_particles([p2.particle, p3.particle], g)
+
+
 def main():
     unittest.main()
 
@@ -0,0 +1,104 @@
+"""Unit tests for the parser options in pythiaplotter.parsers"""
+
+
+from __future__ import absolute_import
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from subprocess import PIPE, STDOUT, Popen
+import pythiaplotter.parsers as parsers
+from pythiaplotter.parsers import ParserOption
+from pythiaplotter.parsers.pythia8_parser import Pythia8Parser
+from pythiaplotter.parsers.hepmc_parser import HepMCParser
+from pythiaplotter.parsers.lhe_parser import LHEParser
+from pythiaplotter.parsers.cmssw_particle_list_parser import CMSSWParticleListParser
+from pythiaplotter.parsers.herwig_parser import HerwigParser
+
+
+HAVE_ROOT = "HEPPY" in parsers.parser_opts
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ParserOption_Test(unittest.TestCase):
+
+    def test_parsers(self):
+        expected = {
+            "PYTHIA": Pythia8Parser,
+            "HEPMC": HepMCParser,
+            "LHE": LHEParser,
+            "CMSSW": CMSSWParticleListParser,
+            "HERWIG": HerwigParser,
+        }
+        for name, parser in expected.items():
+            self.assertIs(parsers.parser_opts[name].parser, parser)
+
+    @unittest.skipIf(not HAVE_ROOT, "PyROOT not available")
+    def test_heppy_parser(self):
+        from pythiaplotter.parsers.heppy_parser import HeppyParser
+        self.assertIs(parsers.parser_opts["HEPPY"].parser, HeppyParser)
+        self.assertIs(parsers.HeppyParser, HeppyParser)
+
+    @unittest.skipIf(HAVE_ROOT, "PyROOT available")
+    def test_no_heppy_parser(self):
+        with self.assertRaises(AttributeError):
+            getattr(parsers, "HeppyParser")
+        with self.assertRaises(ImportError):
+            from pythiaplotter.parsers import HeppyParser  # noqa: F401
+
+    def test_heppy_parser_import(self):
+        """HeppyParser can be imported from the package, but ROOT is only imported then.
+
+        Run in a new interpreter with a stand-in ROOT module,
+        since the package is only imported once per process.
+        """
+        root_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(root_dir, "ROOT.py"), "w") as f:
+                f.write("class _Stub(object):\n"
+                        "    def SetBatch(self, batch):\n"
+                        "        pass\n"
+                        "PyConfig = gROOT = _Stub()\n")
+            code = ("import sys\n"
+                    "import pythiaplotter.parsers as parsers\n"
+                    "assert 'ROOT' not in sys.modules\n"
+                    "from pythiaplotter.parsers import HeppyParser\n"
+                    "from pythiaplotter.parsers.heppy_parser import HeppyParser as Expected\n"
+                    "assert HeppyParser is Expected is parsers.parser_opts['HEPPY'].parser\n"
+                    "assert getattr(parsers, 'HeppyParser') is Expected\n"
+                    "assert 'ROOT' in sys.modules\n")
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(
+                [root_dir, REPO_DIR] + [p for p in [env.get("PYTHONPATH")] if p])
+            p = Popen([sys.executable, "-c", code], stdout=PIPE, stderr=STDOUT, env=env)
+            out, _ = p.communicate()
+            self.assertEqual(p.returncode, 0, out)
+        finally:
+            shutil.rmtree(root_dir)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            getattr(parsers, "NotAParser")
+
+    def test_lazy_parser(self):
+        """A "module:class" parser is only imported when first used"""
+        opt = ParserOption(description="Test", parser="pythiaplotter.parsers.lhe_parser:LHEParser",
+                           default_representation="NODE", file_extension=None)
+        self.assertIsInstance(opt._parser, str)
+        self.assertIs(opt.parser, LHEParser)
+        self.assertIs(opt._parser, LHEParser)
+
+    def test_lazy_parser_missing(self):
+        opt = ParserOption(description="Test", parser="pythiaplotter.parsers.no_such_parser:Parser",
+                           default_representation="NODE", file_extension=None)
+        with self.assertRaises(ImportError):
+            opt.parser
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
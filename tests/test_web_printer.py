@@ -0,0 +1,193 @@
+"""Unit tests for web_printer"""
+
+
+from __future__ import absolute_import, unicode_literals
+import argparse
+import io
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from string import Template
+import networkx as nx
+from pkg_resources import resource_filename
+import pythiaplotter.printers.web_printer as wp
+
+
+class Template_Test(unittest.TestCase):
+    """Test filling templates gives the same as string.Template.safe_substitute"""
+
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.template_dir)
+
+    def check_fill(self, text, field_data):
+        template_name = "template%d.html" % len(os.listdir(self.template_dir))
+        template_file = os.path.join(self.template_dir, template_name)
+        with io.open(template_file, "w", encoding="utf-8") as f:
+            f.write(text)
+        expected = Template(text).safe_substitute(field_data).encode("utf-8")
+        self.assertEqual(wp.fill_template(template_file, field_data), expected)
+
+    def test_fields(self):
+        self.check_fill("<h1>${title}</h1>$title ${title}s", dict(title="Event"))
+
+    def test_unknown_fields(self):
+        self.check_fill("${title} ${missing} $missing $title", dict(title="Event"))
+
+    def test_escapes(self):
+        self.check_fill("$$ $${title} $$title ${title}$$", dict(title="Event"))
+
+    def test_invalid_placeholders(self):
+        self.check_fill("$ $1 ${ ${1} ${title $.ajax() total: 5$", dict(title="Event"))
+
+    def test_no_fields(self):
+        self.check_fill("", {})
+        self.check_fill("plain text", dict(title="Event"))
+
+    def test_values(self):
+        self.check_fill("${title} \u00b5 ${eventnum} ${ratio}",
+                        dict(title="\u03c4\u207a\u03c4\u207b", eventnum=12, ratio=0.5))
+
+    def test_bytes_values(self):
+        """bytes (e.g. from orjson) are inserted as they are"""
+        template_file = os.path.join(self.template_dir, "bytes.html")
+        with io.open(template_file, "w", encoding="utf-8") as f:
+            f.write("var nodes = ${nodedata};")
+        self.assertEqual(wp.fill_template(template_file, dict(nodedata=b'[{"id":1}]')),
+                         b'var nodes = [{"id":1}];')
+
+    def test_vis_template(self):
+        template_file = resource_filename('pythiaplotter', 'printers/templates/vis_template.html')
+        with io.open(template_file, encoding="utf-8") as f:
+            text = f.read()
+        field_data = dict(title="\u03c4 event", inputfile="test.hepmc", eventnum=1,
+                          nodedata='[{"id": 1}]', edgedata='[]', pythia8status='{}')
+        self.assertEqual(wp.fill_template(template_file, field_data),
+                         Template(text).safe_substitute(field_data).encode("utf-8"))
+
+    def test_write_webpage(self):
+        output_filename = os.path.join(self.template_dir, "out.html")
+        field_data = dict(title="\u03c4 event")
+        wp.write_webpage(field_data, output_filename)
+        template_file = resource_filename('pythiaplotter', 'printers/templates/vis_template.html')
+        with io.open(output_filename, 'rb') as f:
+            self.assertEqual(f.read(), wp.fill_template(template_file, field_data))
+
+
+class Renderer_Test(unittest.TestCase):
+    """Test running the layout renderer, using small python scripts in place of dot"""
+
+    def setUp(self):
+        self.script_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.script_dir)
+
+    def make_renderer(self, body):
+        """Make an executable python script that acts as a renderer"""
+        script = os.path.join(self.script_dir, "renderer%d" % len(os.listdir(self.script_dir)))
+        with open(script, "w") as f:
+            f.write("#!%s\nimport sys, time\n%s\n" % (sys.executable, body))
+        os.chmod(script, os.stat(script).st_mode | stat.S_IXUSR)
+        return script
+
+    def make_echo_renderer(self):
+        """Make a renderer that echoes its input straight back"""
+        return self.make_renderer("out = getattr(sys.stdout, 'buffer', sys.stdout)\n"
+                                  "inp = getattr(sys.stdin, 'buffer', sys.stdin)\n"
+                                  "while True:\n"
+                                  "    chunk = inp.read(1024)\n"
+                                  "    if not chunk:\n"
+                                  "        break\n"
+                                  "    out.write(chunk)\n"
+                                  "    out.flush()")
+
+    def test_large_graph(self):
+        """Input bigger than a pipe buffer, echoed straight back, mustn't deadlock"""
+        renderer = self.make_echo_renderer()
+        gv_str = "digraph g{%s}" % "".join("%d -> %d;" % (i, i + 1) for i in range(100000))
+        self.assertEqual(wp.get_dot_json(gv_str, renderer), gv_str.encode())
+        dot = wp.DotRunner(gv_str, renderer)
+        try:
+            self.assertEqual(dot.result(), gv_str.encode())
+        finally:
+            dot.stop()
+
+    def test_renderer_error(self):
+        renderer = self.make_renderer("sys.stderr.write('bad graph')\nsys.exit(1)")
+        with self.assertRaises(RuntimeError):
+            wp.get_dot_json("digraph g{1 -> 2;}", renderer)
+        dot = wp.DotRunner("digraph g{1 -> 2;}", renderer)
+        try:
+            with self.assertRaises(RuntimeError):
+                dot.result()
+        finally:
+            dot.stop()
+
+    def test_layout_runs_in_background(self):
+        """The renderer gets the whole graph without waiting for result()"""
+        done_file = os.path.join(self.script_dir, "done")
+        renderer = self.make_renderer("data = sys.stdin.read()\n"
+                                      "open(%r, 'w').write(data)\n"
+                                      "sys.stdout.write('{}')" % done_file)
+        gv_str = "digraph g{%s}" % "".join("%d -> %d;" % (i, i + 1) for i in range(100000))
+        dot = wp.DotRunner(gv_str, renderer)
+        try:
+            for _ in range(500):
+                if dot.process.poll() is not None:
+                    break
+                time.sleep(0.01)
+            self.assertIsNotNone(dot.process.poll())
+            with open(done_file) as f:
+                self.assertEqual(f.read(), gv_str)
+            self.assertEqual(dot.result(), b"{}")
+        finally:
+            dot.stop()
+
+    def test_stop(self):
+        dot = wp.DotRunner("digraph g{1 -> 2;}", self.make_renderer("time.sleep(60)"))
+        dot.stop()
+        self.assertIsNotNone(dot.process.poll())
+
+    def test_renderer_killed_on_error(self):
+        """If making the webpage fails before the layout is collected,
+        the renderer isn't left running"""
+        renderer = self.make_renderer("time.sleep(60)")
+        started = []
+
+        class DotRunner(wp.DotRunner):
+            __slots__ = ()
+
+            def __init__(self, *args):
+                super(DotRunner, self).__init__(*args)
+                started.append(self)
+
+        # a particle without a pdgid makes create_vis_dicts fail
+        graph = nx.MultiDiGraph()
+        graph.add_edge(1, 2, particle=object())
+        event = argparse.Namespace(graph=graph)
+        opts = argparse.Namespace(output=os.path.join(self.script_dir, "out.html"),
+                                  layout=renderer, GRAPH_OPTS={})
+
+        dot_runner_orig = wp.DotRunner
+        wp.DotRunner = DotRunner
+        try:
+            with self.assertRaises(AttributeError):
+                wp.VisPrinter(opts).print_event(event)
+        finally:
+            wp.DotRunner = dot_runner_orig
+        self.assertEqual(len(started), 1)
+        self.assertIsNotNone(started[0].process.poll())
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()